@@ -4,7 +4,7 @@
 #
 # Recomendado: pip install mwparserfromhell
 
-import os, re, json, time, pathlib, requests, shutil
+import os, re, json, time, pathlib, requests, shutil, hashlib
 from collections import deque
 from pathlib import Path
 
@@ -163,12 +163,67 @@ RE_PASSIVE = re.compile(r"\{\{\s*(passive(?:\s+skill)?)\b", re.I)
 RE_ASSIST  = re.compile(r"\{\{\s*(assist(?:\s+infobox)?)\b", re.I)
 RE_SPECIAL = re.compile(r"\{\{\s*(special(?:\s+infobox)?)\b", re.I)
 
+# Leitura rápida: tokens que importam para achar nomes de template. Tudo que
+# o mwparserfromhell trataria de forma especial ({{{arg}}}, comentários,
+# nowiki/pre...) torna a página "ambígua" e ela vai para o parser completo.
+RE_SCAN_TOKEN = re.compile(
+    r"\{\{\{|\{\{|\}\}|<!--|<(?:nowiki|pre|source|syntaxhighlight|math|includeonly|noinclude|onlyinclude)\b",
+    re.I)
+RE_SCAN_NAME = re.compile(r"([^|{}<>\[\]]*)(\||\}\})")
+
+AMBIGUOUS = None
+
+def scan_type(wikitext: str):
+    """
+    Lê os nomes dos templates na ordem em que abrem (a mesma do
+    filter_templates) e para no primeiro que está no TEMPLATE_MAP, sem montar
+    a árvore. Retorna o tipo, 'Unknown', ou AMBIGUOUS quando só o parser
+    completo sabe responder.
+    """
+    opens = []  # posições de "{{" ainda sem "}}"
+    candidate = None  # (posição, tipo) do primeiro template do mapa, até confirmar que fecha
+    for m in RE_SCAN_TOKEN.finditer(wikitext):
+        tok = m.group(0)
+        if tok == "{{":
+            if candidate:
+                opens.append(m.start())  # template dentro do candidato
+                continue
+            nm = RE_SCAN_NAME.match(wikitext, m.end())
+            if not nm:
+                return AMBIGUOUS
+            raw = nm.group(1).strip().lower()
+            if "\n" in raw:
+                return AMBIGUOUS
+            opens.append(m.start())
+            if raw in IGNORE_TEMPLATES:
+                continue
+            name = " ".join(raw.split())
+            if name in TEMPLATE_MAP:
+                candidate = (m.start(), TEMPLATE_MAP[name])
+        elif tok == "}}":
+            if not opens:
+                return AMBIGUOUS
+            start = opens.pop()
+            if candidate and start == candidate[0]:
+                return candidate[1]
+        else:
+            return AMBIGUOUS
+    # sem candidato: só é seguro dizer Unknown se todos os "{{" fecharam
+    return "Unknown" if not opens and not candidate else AMBIGUOUS
+
 def detect_type_wikitext(wikitext: str) -> str:
     """Retorna 'Weapons', 'Passives', 'Assists', 'Specials' ou 'Unknown'."""
     if not wikitext or not wikitext.strip():
         return "Unknown"
 
-    if _HAS_MW:
+    # leitura rápida dos nomes de template; parse completo só se for ambíguo.
+    # 'Unknown' da leitura rápida ainda passa pelo fallback por regex
+    # ({{Weapon Refine|...}}, {{Passive skill list}}...), como o mw.parse passaria
+    typ = scan_type(wikitext)
+    if typ is not AMBIGUOUS and typ != "Unknown":
+        return typ
+
+    if typ is AMBIGUOUS and _HAS_MW:
         try:
             parsed = mw.parse(wikitext)
             for tpl in parsed.filter_templates():
@@ -192,6 +247,55 @@ def detect_type_wikitext(wikitext: str) -> str:
         return "Specials"
     return "Unknown"
 
+# ---------- Cache de classificação ----------
+DETECT_VERSION = 2  # suba ao mudar a lógica do detect_type_wikitext: invalida o cache
+
+class TypeCache:
+    """
+    sha1(conteúdo) -> tipo detectado, salvo em disco entre execuções; páginas
+    sem mudança não passam de novo pelo detect_type_wikitext. Só vale para as
+    mesmas regras (TEMPLATE_MAP/IGNORE_TEMPLATES/DETECT_VERSION): se mudarem, começa vazio.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.types = {}
+        self.seen = {}
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("rules") == self.rules():
+            self.types = data.get("types", {})
+
+    @staticmethod
+    def rules() -> str:
+        spec = [sorted(TEMPLATE_MAP.items()), sorted(IGNORE_TEMPLATES), DETECT_VERSION]
+        return hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()
+
+    def classify(self, wikitext: str) -> str:
+        key = hashlib.sha1(wikitext.encode("utf-8")).hexdigest()
+        typ = self.types.get(key)
+        if typ is None:
+            typ = detect_type_wikitext(wikitext)
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.seen[key] = typ
+        return typ
+
+    def save(self):
+        # guarda só o que foi visto nesta execução
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"rules": self.rules(), "types": self.seen}, f)
+        os.replace(tmp_path, self.path)
+
+    def summary(self) -> str:
+        return f"[Skills] cache de tipos: {self.hits} acertos, {self.misses} faltas"
+
 # ---------- Pipeline por categoria ----------
 def dump_category_tree(root_cat: str):
     # 1) todas as subcategorias
@@ -247,6 +351,7 @@ def dump_category_tree(root_cat: str):
     for sd in skills_subdirs:
         os.makedirs(os.path.join(base_dir, sd), exist_ok=True)
 
+    type_cache = TypeCache(os.path.join(base_dir, ".type-cache.json"))
     ndjson_path = os.path.join(base_dir, "pages.ndjson")
     with open(ndjson_path, "w", encoding="utf-8") as nd:
         for pid in pageids:
@@ -255,7 +360,7 @@ def dump_category_tree(root_cat: str):
             content = d.get("content", "")
             ts = d.get("timestamp")
 
-            detected = detect_type_wikitext(content)
+            detected = type_cache.classify(content)
             if detected not in skills_subdirs:
                 detected = "Unknown"
 
@@ -273,6 +378,9 @@ def dump_category_tree(root_cat: str):
 
             print(f"[saved] Skills::{detected} :: {title} -> {detected}/{filename}")
 
+    type_cache.save()
+    print(type_cache.summary())
+
 def main():
     print("Baixando FEH Wiki (Heroes/Weapons/Skills)…")
     Path(OUT_DIR).mkdir(exist_ok=True)
@@ -1,38 +1,26 @@
 # build_assists_json.py
 # Gera assists-list.json a partir dos .wiki em feh_wiki_dump/Skills/pages/Assists
+# (ou, com --manifest, direto do Skills/pages.ndjson via manifest.json do split_skill_pages.py)
 # Requer: pip install mwparserfromhell
 
 import os
 import json
-import pathlib
+import argparse
 import re
 from typing import Dict, Any, List, Optional
-import mwparserfromhell as mw
+from parse_cache import open_cache
+from infobox_extract import extract_template, extract_inner_args_from_template_value
+from skill_pages import MANIFEST_JSON, kind_pages
 
 BASE_DIR = os.path.dirname(__file__)
 ASSISTS_DIR = os.path.join(BASE_DIR, "feh_wiki_dump", "Skills", "pages", "Assists")
 OUT_JSON = os.path.join(BASE_DIR, "assists-list.json")
+PARSE_VERSION = 1  # suba ao mudar o que extract_assist_params devolve (invalida o parse cache)
 
 # ---------------- helpers ----------------
 def clean_str(s: Optional[str]) -> str:
     return (str(s).strip() if s is not None else "")
 
-def tpl_name(t) -> str:
-    return str(t.name).strip().lower()
-
-def params_to_dict(t) -> Dict[str, str]:
-    d: Dict[str, str] = {}
-    for p in t.params:
-        d[str(p.name).strip()] = str(p.value).strip()
-    return d
-
-def get_template(parsed, wanted: str):
-    wl = wanted.strip().lower()
-    for t in parsed.filter_templates():
-        if tpl_name(t) == wl:
-            return t
-    return None
-
 def strip_links(text: str) -> str:
     # [[x|y]] -> y ; [[x]] -> x ; remove '''bold''' e ''italic''
     if not text:
@@ -42,29 +30,6 @@ def strip_links(text: str) -> str:
     text = text.replace("'''", "").replace("''", "")
     return text.strip()
 
-def extract_inner_args_from_template_value(val: str, allowed=("movelist","weaponlist")) -> str:
-    """
-    "{{MoveList|all}}"            -> "all"
-    "{{WeaponList|exclude=Staff}}"-> "exclude=Staff"
-    "Close"                       -> "Close"
-    """
-    if not val:
-        return ""
-    parsed = mw.parse(val)
-    tmpls = [t for t in parsed.filter_templates() if tpl_name(t) in allowed]
-    if not tmpls:
-        return val.strip().strip("{} ").strip()
-    t = tmpls[0]
-    parts: List[str] = []
-    for p in t.params:
-        name = str(p.name).strip()
-        value = str(p.value).strip()
-        if name.isdigit():
-            parts.append(value)
-        else:
-            parts.append(f"{name}={value}")
-    return ", ".join(parts)
-
 def normalize_properties(props: str) -> str:
     """Converte listas separadas por vírgula/pipe em string 'a, b, c'."""
     if not props:
@@ -95,31 +60,32 @@ def build_assist_object(sdict: Dict[str, str], fallback_name: str) -> Dict[str,
     }
 
 # ---------------- pipeline ----------------
-def parse_assist_file(text: str, fallback_name: str) -> Optional[Dict[str, Any]]:
-    parsed = mw.parse(text)
-    tpl = get_template(parsed, "Assist")
-    if not tpl:
-        return None
-    sdict = params_to_dict(tpl)
-    return build_assist_object(sdict, fallback_name)
+def extract_assist_params(text: str) -> Optional[Dict[str, str]]:
+    """Parâmetros do {{Assist}} (ou None); é o que fica no parse cache."""
+    return extract_template(text, "Assist")
+
+def parse_assist_file(text: str, fallback_name: str, cache=None) -> Optional[Dict[str, Any]]:
+    sdict = cache.fetch(text, lambda: extract_assist_params(text)) if cache else extract_assist_params(text)
+    return build_assist_object(sdict, fallback_name) if sdict is not None else None
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Gera assists-list.json a partir das páginas de Assists.")
+    ap.add_argument("--manifest", nargs="?", const=MANIFEST_JSON, metavar="PATH",
+                    help="lê as páginas do pages.ndjson via manifest.json (padrão: feh_wiki_dump/Skills/manifest.json)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignora o parse cache (feh_wiki_dump/.parse-cache.sqlite)")
+    return ap.parse_args()
 
 def main():
-    if not os.path.isdir(ASSISTS_DIR):
-        raise SystemExit(f"Pasta não encontrada: {ASSISTS_DIR}")
+    args = parse_args()
+    cache = open_cache("assists", PARSE_VERSION, enabled=not args.no_cache)
+    pages = kind_pages("Assists", ASSISTS_DIR, args.manifest)
 
     assists: List[Dict[str, Any]] = []
-    files = sorted([f for f in os.listdir(ASSISTS_DIR) if f.endswith(".wiki")], key=str.lower)
-
-    for fname in files:
-        path = os.path.join(ASSISTS_DIR, fname)
-        try:
-            text = pathlib.Path(path).read_text(encoding="utf-8")
-        except Exception as e:
-            print(f"[skip] erro lendo {fname}: {e}")
-            continue
 
+    for fname, text in pages:
         fallback_name = fname.split("__")[0]
-        obj = parse_assist_file(text, fallback_name)
+        obj = parse_assist_file(text, fallback_name, cache)
         if obj is None:
             print(f"[skip] sem template {{Assist}}: {fname}")
             continue
@@ -131,6 +97,8 @@ def main():
         json.dump(assists, f, ensure_ascii=False, indent=2)
 
     print(f"\nGerado: {OUT_JSON} ({len(assists)} assists)")
+    if cache:
+        cache.close()
 
 if __name__ == "__main__":
     main()
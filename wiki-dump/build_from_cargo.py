@@ -0,0 +1,490 @@
+# build_from_cargo.py
+# Gera heroes/weapons/passives/assists/specials-list.json direto das tabelas
+# Cargo da wiki (action=cargoquery), sem baixar wikitext e sem mwparserfromhell.
+# É um segundo caminho, bem mais rápido, ao lado dos build_*_json.py; use
+# --validate para comparar o resultado com refined-data/ (saída dos builders).
+# Campos sem coluna no Cargo (NO_CARGO_FIELDS) saem vazios; o --validate os lista à parte.
+# Uso:
+#   python build_from_cargo.py                          # grava os 5 *-list.json em cargo-data/
+#   python build_from_cargo.py --only weapons,assists
+#   python build_from_cargo.py --validate               # compara com refined-data/, não grava
+#   python build_from_cargo.py --api http://127.0.0.1:8765/api.php
+#   python build_from_cargo.py --record DIR | --replay DIR
+# Requer: pip install requests
+
+import os
+import re
+import json
+import html
+import time
+import argparse
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import requests
+from wiki_common import (RETRY_HTTP_STATUS, RETRY_API_CODES, safe_filename,
+                         Cassette, backoff_delay)
+
+API = "https://feheroes.fandom.com/api.php"
+USER_AGENT = "FEH-Wiki-Dumper/1.2 (+local)"
+
+BASE_DIR = os.path.dirname(__file__)
+REFINED_DIR = os.path.join(BASE_DIR, "refined-data")
+# pasta própria: os *-list.json daqui não têm os NO_CARGO_FIELDS e não devem
+# sobrescrever os gerados pelos builders de wikitext
+CARGO_OUT_DIR = os.path.join(BASE_DIR, "cargo-data")
+
+CARGO_LIMIT = 500          # máximo por página do cargoquery para usuários comuns
+MAXLAG_SECONDS = 5
+MAX_RETRIES = 8
+
+KINDS = ["heroes", "weapons", "passives", "assists", "specials"]
+
+# Colunas das tabelas Cargo (ver Special:CargoTables na wiki). Se a wiki mudar
+# o esquema, é aqui que se ajusta; o --validate aponta os campos que divergirem.
+# _ID vai em toda consulta: é a única ordem estável para paginar com offset
+ROW_ID = "_ID=RowID"
+PAGE_FIELDS = ["_pageName=Page", "_pageID=PageID", ROW_ID]
+SKILL_FIELDS = PAGE_FIELDS + [
+    "Name", "WikiName", "GroupName", "TagID", "Scategory", "RefinePath",
+    "UseRange", "Description", "Required", "Next", "PromotionRarity", "PromotionTier",
+    "Exclusive", "SP", "CanUseMove", "CanUseWeapon", "WeaponType", "Might", "StatModifiers",
+    "Cooldown", "WeaponEffectiveness", "Properties",
+]
+HERO_FIELDS = PAGE_FIELDS + [
+    "Name", "Title", "WikiName", "Origin", "WeaponType", "MoveType",
+    "ReleaseDate", "Properties",
+]
+STATS_FIELDS = [
+    ROW_ID, "WikiName",
+    "Lv1HP5", "Lv1Atk5", "Lv1Spd5", "Lv1Def5", "Lv1Res5",
+    "HPGR3", "AtkGR3", "SpdGR3", "DefGR3", "ResGR3",
+]
+HERO_SKILL_FIELDS = [ROW_ID, "WikiName", "skill", "skillPos"]
+
+# Campos dos builders sem coluna nas tabelas acima: saem vazios (como o builder
+# grava quando o parâmetro falta) e o --validate os lista à parte.
+NO_CARGO_FIELDS = {
+    "heroes": [
+        "infobox.poolRarities", "infobox.LegendaryEffect", "infobox.MythicEffect",
+        "infobox.BoostHP", "infobox.BoostSpd", "infobox.emblemEffect",
+        "infobox.secondPerson", "infobox.harmonized", "infobox.duo",
+    ],
+    "weapons": [
+        "Weapon.intID", "Weapon.upgradedEffect", "Weapon.refinePaths", "Weapon.refineSP",
+        "Weapon.refineMedals", "Weapon.refineStones", "Weapon.refineDews",
+        "Weapon.image", "Weapon.userVersions", "Weapon.extraSkills",
+    ],
+    "passives": ["Passive.levels[].altNames"],
+    "assists": [],
+    "specials": [],
+}
+
+session = requests.Session()
+session.headers.update({"User-Agent": USER_AGENT})
+
+cassette: Optional[Cassette] = None  # ativado por --record / --replay
+
+# ---------- Helpers de API ----------
+def mw_get(params: dict) -> dict:
+    if cassette and cassette.mode == "replay":
+        return cassette.play(params)
+    send = {**params, "maxlag": str(MAXLAG_SECONDS)}
+    for attempt in range(MAX_RETRIES):
+        try:
+            resp = session.get(API, params=send, timeout=60)
+        except (requests.ConnectionError, requests.Timeout):
+            time.sleep(backoff_delay(attempt))
+            continue
+        if resp.status_code in RETRY_HTTP_STATUS:
+            time.sleep(backoff_delay(attempt, resp.headers.get("Retry-After")))
+            continue
+        resp.raise_for_status()
+        data = resp.json()
+        if "error" in data:
+            code = data["error"].get("code", "")
+            if code not in RETRY_API_CODES:
+                raise RuntimeError(f"API error {code}: {data['error'].get('info', '')} ({params})")
+            time.sleep(backoff_delay(attempt, resp.headers.get("Retry-After")))
+            continue
+        if cassette:
+            cassette.record(params, data)
+        return data
+    raise RuntimeError(f"API error: {params}")
+
+def cargo_rows(table: str, fields: List[str]) -> List[Dict[str, str]]:
+    """Todas as linhas de uma tabela Cargo em ordem de _ID, paginando de CARGO_LIMIT em CARGO_LIMIT."""
+    rows: List[Dict[str, str]] = []
+    offset = 0
+    while True:
+        params = {
+            "action": "cargoquery",
+            "format": "json",
+            "tables": table,
+            "fields": ",".join(fields),
+            "order_by": "_ID",
+            "limit": str(CARGO_LIMIT),
+            "offset": str(offset),
+        }
+        page = [item.get("title", {}) for item in mw_get(params).get("cargoquery", [])]
+        # o cargoquery devolve os valores com escape HTML (&amp;, &#039; ...)
+        rows.extend({k: html.unescape(v) if isinstance(v, str) else clean_str(v)
+                     for k, v in r.items()} for r in page)
+        if len(page) < CARGO_LIMIT:
+            return rows
+        offset += CARGO_LIMIT
+
+# ---------- Ordem de arquivos dos builders ----------
+def file_order(row: Dict[str, str]) -> str:
+    """Os builders percorrem os .wiki ordenados por str.lower; reproduz a mesma ordem."""
+    return safe_filename(row.get("Page", ""), row.get("PageID", "")).lower()
+
+def fallback_name(row: Dict[str, str]) -> str:
+    return safe_filename(row.get("Page", ""), row.get("PageID", "")).split("__")[0]
+
+# ---------- helpers de conversão (iguais aos dos builders) ----------
+def clean_str(s: Optional[str]) -> str:
+    return (str(s).strip() if s is not None else "")
+
+def to_int(s: Optional[str]) -> Optional[int]:
+    if s is None:
+        return None
+    s = str(s).strip()
+    if s == "":
+        return None
+    try:
+        return int(s)
+    except ValueError:
+        m = re.search(r"\d+", s)
+        return int(m.group(0)) if m else None
+
+def strip_links(text: str) -> str:
+    """[[x|y]] -> y ; [[x]] -> x ; remove '''bold''' e ''italic''."""
+    if not text:
+        return ""
+    text = re.sub(r"\[\[([^|\]]+)\|([^\]]+)\]\]", r"\2", text)
+    text = re.sub(r"\[\[([^\]]+)\]\]", r"\1", text)
+    text = text.replace("'''", "").replace("''", "")
+    return text.strip()
+
+def strip_links_and_html(text: str) -> str:
+    """Remove [[links]]/formatação e converte <br> em quebras de linha."""
+    if not text:
+        return ""
+    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
+    text = re.sub(r"\[\[([^|\]]+)\|([^\]]+)\]\]", r"\2", text)
+    text = re.sub(r"\[\[([^\]]+)\]\]", r"\1", text)
+    text = text.replace("'''", "").replace("''", "")
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    return text
+
+def parse_stat_modifiers(s: str) -> Dict[str, str]:
+    """"0,14,3,0,0" -> {"HP":"0","ATK":"14","SPD":"3","DEF":"0","RES":"0"}"""
+    s = (s or "").strip()
+    if not s:
+        return {"HP": "", "ATK": "", "SPD": "", "DEF": "", "RES": ""}
+    parts = [p.strip() for p in s.split(",")]
+    parts += [""] * (5 - len(parts))
+    return {"HP": parts[0], "ATK": parts[1], "SPD": parts[2], "DEF": parts[3], "RES": parts[4]}
+
+def normalize_properties(props: str) -> str:
+    """Converte listas separadas por vírgula/pipe em string 'a, b, c' sem duplicatas."""
+    if not props:
+        return ""
+    toks = [t.strip() for t in re.split(r"[,\|]", props) if t.strip()]
+    return ", ".join(dict.fromkeys(toks))
+
+def normalize_hero_properties(props: str) -> str:
+    """Como em build_heroes_json.py: specRate_*/demoted_* perdem '_' e dígitos."""
+    if not props:
+        return ""
+    raw_tokens = re.split(r"[,\|]", props) if ("," in props or "|" in props) else props.split()
+    tokens = [re.sub(r"(?i)\b(specRate|demoted)[_\d]*\b", lambda m: m.group(1), t.strip())
+              for t in raw_tokens if t.strip()]
+    return ", ".join(dict.fromkeys(tokens))
+
+def format_release_date(s: str) -> str:
+    """Cargo guarda datas ISO ('2017-02-02'); o infobox usa 'February 2, 2017'."""
+    s = clean_str(s)
+    try:
+        d = datetime.strptime(s[:10], "%Y-%m-%d")
+    except ValueError:
+        return s
+    return f"{d.strftime('%B')} {d.day}, {d.year}"
+
+# ---------- Linhas Cargo -> objetos dos builders ----------
+def weapon_object(r: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "Weapon": {
+            "Name": clean_str(r.get("Name")) or fallback_name(r),
+            "tagid": clean_str(r.get("TagID")),
+            "intID": "",
+            "weaponType": clean_str(r.get("WeaponType")),
+            "might": clean_str(r.get("Might")),
+            "range": clean_str(r.get("UseRange")),
+            "cooldown": clean_str(r.get("Cooldown")),
+            "effect": strip_links_and_html(clean_str(r.get("Description"))),
+            "upgradedEffect": "",
+            "cost": clean_str(r.get("SP")),
+            "exclusive": clean_str(r.get("Exclusive")),
+            "required": clean_str(r.get("Required")),
+            "next": clean_str(r.get("Next")),
+            "promotionRarity": clean_str(r.get("PromotionRarity")),
+            "promotionTier": clean_str(r.get("PromotionTier")),
+            "canUseMove": clean_str(r.get("CanUseMove")),
+            "canUseWeapon": clean_str(r.get("CanUseWeapon")),
+            "effectiveness": clean_str(r.get("WeaponEffectiveness")),
+            "statModifiers": parse_stat_modifiers(clean_str(r.get("StatModifiers"))),
+            # intID, upgradedEffect, refine*, image, userVersions, extraSkills: NO_CARGO_FIELDS
+            "refinePaths": "",
+            "refineSP": "",
+            "refineMedals": "",
+            "refineStones": "",
+            "refineDews": "",
+            "properties": normalize_properties(clean_str(r.get("Properties"))),
+            "image": "",
+            "userVersions": [],
+            "extraSkills": [],
+        }
+    }
+
+def assist_object(r: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "Assist": {
+            "name": clean_str(r.get("Name")) or fallback_name(r),
+            "exclusive": clean_str(r.get("Exclusive")),
+            "canUseWeapon": clean_str(r.get("CanUseWeapon")),
+            "canUseMove": clean_str(r.get("CanUseMove")),
+            "cost": clean_str(r.get("SP")),
+            "range": clean_str(r.get("UseRange")),
+            "effect": strip_links(clean_str(r.get("Description"))),
+            "required": clean_str(r.get("Required")),
+            "properties": normalize_properties(clean_str(r.get("Properties"))),
+        }
+    }
+
+def special_object(r: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "Special": {
+            "Name": clean_str(r.get("Name")) or fallback_name(r),
+            "Charge": clean_str(r.get("Cooldown")),
+            "Effect": strip_links(clean_str(r.get("Description"))),
+            "Cost": clean_str(r.get("SP")),
+            "Required": clean_str(r.get("Required")),
+            "Exclusive": clean_str(r.get("Exclusive")),
+            "CanUseMove": clean_str(r.get("CanUseMove")),
+            "CanUseWeapon": clean_str(r.get("CanUseWeapon")),
+            # build_specials_json.py não remove duplicatas aqui
+            "Properties": ", ".join(t.strip() for t in re.split(r"[,\|]", clean_str(r.get("Properties"))) if t.strip()),
+        }
+    }
+
+PASSIVE_TYPES = {"passivea": "A", "passiveb": "B", "passivec": "C", "sacredseal": "S", "passivex": "X"}
+
+def passive_object(rows: List[Dict[str, str]]) -> Dict[str, Any]:
+    """Uma página de passiva = várias linhas (uma por nível), na ordem de _ID."""
+    first = rows[0]
+    levels = [{
+        "name": clean_str(r.get("Name")),
+        "altNames": [],                                    # NO_CARGO_FIELDS
+        "tagid": clean_str(r.get("TagID")),
+        "effect": strip_links_and_html(clean_str(r.get("Description"))),
+        "cost": clean_str(r.get("SP")),
+        "required": clean_str(r.get("Required")),
+        "promotionRarity": clean_str(r.get("PromotionRarity")),
+        "promotionTier": clean_str(r.get("PromotionTier")),
+        "next": clean_str(r.get("Next")),
+        "statModifiers": parse_stat_modifiers(clean_str(r.get("StatModifiers"))),
+    } for r in rows if clean_str(r.get("Name"))]
+    return {
+        "Passive": {
+            "name": clean_str(first.get("GroupName")) or fallback_name(first),
+            "type": PASSIVE_TYPES.get(clean_str(first.get("Scategory")).lower(), ""),
+            "exclusive": clean_str(first.get("Exclusive")),
+            "canUseWeapon": clean_str(first.get("CanUseWeapon")),
+            "canUseMove": clean_str(first.get("CanUseMove")),
+            "properties": normalize_properties(clean_str(first.get("Properties"))),
+            "levels": levels,
+        }
+    }
+
+def hero_object(r: Dict[str, str], stats: Optional[Dict[str, str]],
+                skills: Dict[str, List[str]]) -> Dict[str, Any]:
+    stats = stats or {}
+    return {
+        "infobox": {
+            "Name": clean_str(r.get("Name")) or fallback_name(r),
+            "Title": clean_str(r.get("Title")),
+            "WeaponType": clean_str(r.get("WeaponType")),
+            "MoveType": clean_str(r.get("MoveType")),
+            "Origin": clean_str(r.get("Origin")),
+            "releaseDate": format_release_date(r.get("ReleaseDate")),
+            # poolRarities e LegendaryEffect..duo: NO_CARGO_FIELDS
+            "poolRarities": None,
+            "Properties": normalize_hero_properties(clean_str(r.get("Properties"))),
+            "LegendaryEffect": "",
+            "MythicEffect": "",
+            "BoostHP": None,
+            "BoostSpd": None,
+            "emblemEffect": "",
+            "secondPerson": "",
+            "harmonized": "",
+            "duo": ""
+        },
+        "stats": {
+            "Lv1": {k: to_int(stats.get(f"Lv1{c}5"))
+                    for k, c in zip(("HP", "ATK", "SPD", "DEF", "RES"), ("HP", "Atk", "Spd", "Def", "Res"))},
+            "GrowthRates": {k: to_int(stats.get(f"{c}GR3"))
+                            for k, c in zip(("HP", "ATK", "SPD", "DEF", "RES"), ("HP", "Atk", "Spd", "Def", "Res"))},
+        },
+        "weapons": skills.get("weapon", []),
+        "assists": skills.get("assist", []),
+        "specials": skills.get("special", []),
+        "passives": {letter: skills.get("passive" + letter.lower(), []) for letter in ("A", "B", "C", "X")},
+    }
+
+# ---------- Montagem das listas ----------
+def group_by_page(rows: List[Dict[str, str]]) -> List[List[Dict[str, str]]]:
+    """Agrupa linhas por página, na ordem de arquivos dos builders."""
+    pages: Dict[str, List[Dict[str, str]]] = defaultdict(list)
+    for r in rows:
+        pages[r.get("PageID", "")].append(r)
+    return sorted(pages.values(), key=lambda rs: file_order(rs[0]))
+
+def build_skill_lists(skill_rows: List[Dict[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+    out: Dict[str, List[Dict[str, Any]]] = {"weapons": [], "passives": [], "assists": [], "specials": []}
+    for rows in group_by_page(skill_rows):
+        cat = clean_str(rows[0].get("Scategory")).lower()
+        # refinos ficam na mesma página da arma; o objeto vem da linha base
+        base = next((r for r in rows if not clean_str(r.get("RefinePath"))), rows[0])
+        if cat == "weapon":
+            out["weapons"].append(weapon_object(base))
+        elif cat == "assist":
+            out["assists"].append(assist_object(base))
+        elif cat == "special":
+            out["specials"].append(special_object(base))
+        elif cat.startswith("passive") or cat == "sacredseal":
+            out["passives"].append(passive_object(rows))
+    return out
+
+def build_hero_list(skill_rows: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    hero_rows = cargo_rows("Heroes", HERO_FIELDS)
+    stats = {r["WikiName"]: r for r in cargo_rows("UnitStats", STATS_FIELDS)}
+
+    # HeroSkills guarda o WikiName da skill; nome e categoria vêm da tabela Skills
+    by_wikiname = {r["WikiName"]: r for r in skill_rows if r.get("WikiName")}
+    skills: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+    hero_skill_rows = cargo_rows("HeroSkills", HERO_SKILL_FIELDS)
+    hero_skill_rows.sort(key=lambda r: to_int(r.get("skillPos")) or 0)
+    for hs in hero_skill_rows:
+        sk = by_wikiname.get(hs.get("skill", ""))
+        if not sk:
+            continue
+        cat = clean_str(sk.get("Scategory")).lower()
+        names = skills[hs.get("WikiName", "")][cat]
+        if sk["Name"] not in names:
+            names.append(sk["Name"])
+
+    hero_rows.sort(key=file_order)
+    return [hero_object(r, stats.get(r.get("WikiName")), skills[r.get("WikiName", "")])
+            for r in hero_rows]
+
+# ---------- Validação contra os builders de wikitext ----------
+def entry_key(kind: str, obj: Dict[str, Any]) -> str:
+    if kind == "heroes":
+        ib = obj["infobox"]
+        return f"{ib['Name']} ({ib['Title']})"
+    inner = next(iter(obj.values()))
+    return inner.get("Name") or inner.get("name") or ""
+
+def flat_fields(obj: Any, prefix: str = "") -> Dict[str, Any]:
+    """{"a": {"b": 1}} -> {"a.b": 1}; listas de dicts viram "a[0].b", as demais são comparadas inteiras."""
+    if isinstance(obj, list) and obj and all(isinstance(v, dict) for v in obj):
+        out: Dict[str, Any] = {f"{prefix}.len": len(obj)}
+        for i, v in enumerate(obj):
+            out.update(flat_fields(v, f"{prefix}[{i}]"))
+        return out
+    if not isinstance(obj, dict):
+        return {prefix: obj}
+    out: Dict[str, Any] = {}
+    for k, v in obj.items():
+        out.update(flat_fields(v, f"{prefix}.{k}" if prefix else k))
+    return out
+
+def validate(kind: str, items: List[Dict[str, Any]], ref_path: str):
+    with open(ref_path, "r", encoding="utf-8") as f:
+        ref = {entry_key(kind, o): o for o in json.load(f)}
+    got = {entry_key(kind, o): o for o in items}
+    blank = set(NO_CARGO_FIELDS[kind])
+    same = 0
+    field_diffs: Dict[str, int] = defaultdict(int)
+    blank_filled: Dict[str, int] = defaultdict(int)  # campo sem coluna no Cargo -> entradas com valor no wikitext
+    for key in ref.keys() & got.keys():
+        a, b = flat_fields(ref[key]), flat_fields(got[key])
+        bad = {re.sub(r"\[\d+\]", "[]", f) for f in a.keys() | b.keys() if a.get(f) != b.get(f)}
+        # sub-campos de um campo em branco (extraSkills[].effectSkill...) contam como o próprio campo
+        bad = {next((n for n in blank if f == n or f.startswith((n + ".", n + "["))), f) for f in bad}
+        for name in bad:
+            (blank_filled if name in blank else field_diffs)[name] += 1
+        same += not (bad - blank)
+    print(f"[validate] {kind}: {len(ref)} no wikitext, {len(got)} no Cargo, "
+          f"{same} idênticos fora de NO_CARGO_FIELDS, {len(ref.keys() - got.keys())} faltando, "
+          f"{len(got.keys() - ref.keys())} extras")
+    for f, n in sorted(field_diffs.items(), key=lambda kv: -kv[1]):
+        print(f"    {f}: {n} divergência(s)")
+    for f in NO_CARGO_FIELDS[kind]:
+        print(f"    {f}: sem coluna no Cargo, vazio em {blank_filled.get(f, 0)} entrada(s) que o wikitext preenche")
+
+# ---------- CLI ----------
+def parse_args():
+    ap = argparse.ArgumentParser(description="Gera os *-list.json a partir das tabelas Cargo da wiki.")
+    ap.add_argument("--api", default=API, help="endpoint api.php (ex.: um espelho local)")
+    ap.add_argument("--only", default=",".join(KINDS),
+                    help="tipos a gerar, separados por vírgula (padrão: todos)")
+    ap.add_argument("--out-dir", default=CARGO_OUT_DIR, help="pasta de saída dos *-list.json (padrão: cargo-data/)")
+    ap.add_argument("--validate", nargs="?", const=REFINED_DIR, metavar="DIR",
+                    help="compara com os *-list.json de DIR (padrão: refined-data/) em vez de gravar")
+    rec = ap.add_mutually_exclusive_group()
+    rec.add_argument("--record", metavar="DIR", help="grava as respostas da API num cassete")
+    rec.add_argument("--replay", metavar="DIR", help="reproduz um cassete gravado, sem rede")
+    args = ap.parse_args()
+    args.only = [k.strip() for k in args.only.split(",") if k.strip()]
+    unknown = set(args.only) - set(KINDS)
+    if unknown:
+        ap.error(f"tipos desconhecidos: {', '.join(sorted(unknown))}")
+    return args
+
+def main():
+    global API, cassette
+    args = parse_args()
+    API = args.api
+    if args.record:
+        cassette = Cassette(args.record, "record")
+    elif args.replay:
+        cassette = Cassette(args.replay, "replay")
+
+    t0 = time.perf_counter()
+    # heróis precisam da tabela Skills para classificar as skills de cada um
+    skill_rows = cargo_rows("Skills", SKILL_FIELDS)
+    lists = build_skill_lists(skill_rows)
+    if "heroes" in args.only:
+        lists["heroes"] = build_hero_list(skill_rows)
+
+    for kind in args.only:
+        fname = f"{kind}-list.json"
+        if args.validate:
+            validate(kind, lists[kind], os.path.join(args.validate, fname))
+            continue
+        os.makedirs(args.out_dir, exist_ok=True)
+        out_path = os.path.join(args.out_dir, fname)
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(lists[kind], f, ensure_ascii=False, indent=2)
+        print(f"Gerado: {out_path} ({len(lists[kind])} {kind})")
+
+    print(f"\nConcluído em {time.perf_counter() - t0:.1f}s")
+    if cassette:
+        print(cassette.summary())
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,26 @@
 # build_heroes_json.py
 # Lê .wiki de feh_wiki_dump/Heroes/pages e gera heroes-list.json no formato solicitado.
+# Uso: python build_heroes_json.py [--jobs N] [--no-cache] [--incremental]   (N processos; 0 = todos os núcleos)
+#   --incremental: reaproveita os heróis cujas páginas não mudaram (estado em feh_wiki_dump/.heroes-list-state.json)
 # Requer: pip install mwparserfromhell
 
 import os
 import json
+import argparse
 import pathlib
 import re
-from typing import Any, Dict, List, Optional
-import mwparserfromhell as mw
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from parse_cache import open_cache
+import infobox_extract
+from infobox_extract import extract_templates
 
 BASE_DIR = os.path.dirname(__file__)
 HERO_PAGES_DIR = os.path.join(BASE_DIR, "feh_wiki_dump", "Heroes", "pages")
 OUT_JSON = os.path.join(BASE_DIR, "heroes-list.json")
+STATE_JSON = os.path.join(BASE_DIR, "feh_wiki_dump", ".heroes-list-state.json")  # usado pelo --incremental
+PARSE_VERSION = 1  # suba ao mudar o que extract_hero_params devolve (invalida o parse cache)
 
 # ---------- helpers de conversão ----------
 def to_int(s: Optional[str]) -> Optional[int]:
@@ -30,24 +39,6 @@ def to_int(s: Optional[str]) -> Optional[int]:
 def clean_str(s: Optional[str]) -> str:
     return (str(s).strip() if s is not None else "")
 
-def tpl_name(tpl) -> str:
-    return str(tpl.name).strip().lower()
-
-def params_to_dict(tpl) -> Dict[str, str]:
-    d: Dict[str, str] = {}
-    for p in tpl.params:
-        key = str(p.name).strip()
-        val = str(p.value).strip()
-        d[key] = val
-    return d
-
-def get_template(parsed, wanted_name: str):
-    wl = wanted_name.strip().lower()
-    for tpl in parsed.filter_templates():
-        if tpl_name(tpl) == wl:
-            return tpl
-    return None
-
 def collect_names(d: Dict[str, str], base: str, max_slots: int = 80) -> List[str]:
     """
     Coleta apenas os nomes: base1, base2, base3...
@@ -154,19 +145,9 @@ def empty_hero() -> Dict[str, Any]:
         }
     }
 
-# ---------- extração por arquivo ----------
-def parse_hero_wikitext(wikitext: str) -> Optional[Dict[str, Any]]:
-    parsed = mw.parse(wikitext)
-
-    # precisa ter o template Hero Infobox; senão, ignoramos a página
-    infobox_tpl = get_template(parsed, "Hero Infobox")
-    if not infobox_tpl:
-        return None
-
-    hero = empty_hero()
-
-    # --- Infobox ---
-    ib = params_to_dict(infobox_tpl)
+# ---------- handlers por template ----------
+# cada um recebe o herói e os parâmetros do seu template (só chamado se o template existe)
+def apply_infobox(hero: Dict[str, Any], ib: Dict[str, str]):
     hero["infobox"]["Name"] = clean_str(ib.get("Name"))
     hero["infobox"]["Title"] = clean_str(ib.get("Title"))
     hero["infobox"]["WeaponType"] = clean_str(ib.get("WeaponType"))
@@ -184,82 +165,232 @@ def parse_hero_wikitext(wikitext: str) -> Optional[Dict[str, Any]]:
     hero["infobox"]["harmonized"] = clean_str(ib.get("harmonized"))
     hero["infobox"]["duo"] = clean_str(ib.get("duo"))
 
-    # --- Stats Page ---
-    stats_tpl = get_template(parsed, "Stats Page")
-    if stats_tpl:
-        s = params_to_dict(stats_tpl)
-        hero["stats"]["Lv1"]["HP"]  = to_int(s.get("Lv1HP"))
-        hero["stats"]["Lv1"]["ATK"] = to_int(s.get("Lv1ATK"))
-        hero["stats"]["Lv1"]["SPD"] = to_int(s.get("Lv1SPD"))
-        hero["stats"]["Lv1"]["DEF"] = to_int(s.get("Lv1DEF"))
-        hero["stats"]["Lv1"]["RES"] = to_int(s.get("Lv1RES"))
-        hero["stats"]["GrowthRates"]["HP"]  = to_int(s.get("GRHP"))
-        hero["stats"]["GrowthRates"]["ATK"] = to_int(s.get("GRATK"))
-        hero["stats"]["GrowthRates"]["SPD"] = to_int(s.get("GRSPD"))
-        hero["stats"]["GrowthRates"]["DEF"] = to_int(s.get("GRDEF"))
-        hero["stats"]["GrowthRates"]["RES"] = to_int(s.get("GRRES"))
-
-    # --- Weapons / Assists / Specials: apenas nomes ---
-    w_tpl = get_template(parsed, "Weapons Table")
-    if w_tpl:
-        w = params_to_dict(w_tpl)
-        hero["weapons"] = collect_names(w, "weapon", max_slots=120)
-
-    a_tpl = get_template(parsed, "Assists Table")
-    if a_tpl:
-        a = params_to_dict(a_tpl)
-        hero["assists"] = collect_names(a, "assist", max_slots=120)
-
-    s_tpl = get_template(parsed, "Specials Table")
-    if s_tpl:
-        sp = params_to_dict(s_tpl)
-        hero["specials"] = collect_names(sp, "special", max_slots=120)
-
-    # --- Passives: interpretar "skills" como passives (A/B/C/X) -> apenas nomes ---
-    p_tpl = get_template(parsed, "Passives Table")
-    if p_tpl:
-        p = params_to_dict(p_tpl)
-        for letter in ("A", "B", "C", "X"):
-            # coleta apenas os nomes (passiveA1, passiveA2, ...)
-            names = collect_names({k.replace(f"passive{letter}", "item"): v
-                                   for k, v in p.items() if k.startswith(f"passive{letter}") and not k.startswith(f"passive{letter}Unlock")},
-                                  "item",
-                                  max_slots=60)
-            hero["passives"][letter] = names
+def apply_stats(hero: Dict[str, Any], s: Dict[str, str]):
+    hero["stats"]["Lv1"]["HP"]  = to_int(s.get("Lv1HP"))
+    hero["stats"]["Lv1"]["ATK"] = to_int(s.get("Lv1ATK"))
+    hero["stats"]["Lv1"]["SPD"] = to_int(s.get("Lv1SPD"))
+    hero["stats"]["Lv1"]["DEF"] = to_int(s.get("Lv1DEF"))
+    hero["stats"]["Lv1"]["RES"] = to_int(s.get("Lv1RES"))
+    hero["stats"]["GrowthRates"]["HP"]  = to_int(s.get("GRHP"))
+    hero["stats"]["GrowthRates"]["ATK"] = to_int(s.get("GRATK"))
+    hero["stats"]["GrowthRates"]["SPD"] = to_int(s.get("GRSPD"))
+    hero["stats"]["GrowthRates"]["DEF"] = to_int(s.get("GRDEF"))
+    hero["stats"]["GrowthRates"]["RES"] = to_int(s.get("GRRES"))
+
+def names_handler(field: str, base: str):
+    """Weapons / Assists / Specials: apenas nomes (weapon1, weapon2, ...)."""
+    def apply(hero: Dict[str, Any], d: Dict[str, str]):
+        hero[field] = collect_names(d, base, max_slots=120)
+    return apply
+
+def apply_passives(hero: Dict[str, Any], p: Dict[str, str]):
+    # interpretar "skills" como passives (A/B/C/X) -> apenas nomes
+    for letter in ("A", "B", "C", "X"):
+        # coleta apenas os nomes (passiveA1, passiveA2, ...)
+        names = collect_names({k.replace(f"passive{letter}", "item"): v
+                               for k, v in p.items() if k.startswith(f"passive{letter}") and not k.startswith(f"passive{letter}Unlock")},
+                              "item",
+                              max_slots=60)
+        hero["passives"][letter] = names
+
+HERO_HANDLERS = {
+    "Hero Infobox": apply_infobox,
+    "Stats Page": apply_stats,
+    "Weapons Table": names_handler("weapons", "weapon"),
+    "Assists Table": names_handler("assists", "assist"),
+    "Specials Table": names_handler("specials", "special"),
+    "Passives Table": apply_passives,
+}
+
+# ---------- extração por arquivo ----------
+def extract_hero_params(wikitext: str) -> Optional[Dict[str, Optional[Dict[str, str]]]]:
+    """
+    Parâmetros de cada template de HERO_HANDLERS (None se ausente), lidos numa
+    passada só; é o que fica no parse cache. None se a página não tem Hero Infobox.
+    """
+    out = extract_templates(wikitext, tuple(HERO_HANDLERS))
+    return out if out["Hero Infobox"] is not None else None
+
+def parse_hero_wikitext(wikitext: str) -> Optional[Dict[str, Any]]:
+    # precisa ter o template Hero Infobox; senão, ignoramos a página
+    templates = extract_hero_params(wikitext)
+    return build_hero(templates) if templates is not None else None
 
+def build_hero(templates: Dict[str, Optional[Dict[str, str]]]) -> Dict[str, Any]:
+    """Entrega cada template encontrado ao seu handler."""
+    hero = empty_hero()
+    for name, params in templates.items():
+        if params is not None:
+            HERO_HANDLERS[name](hero, params)
     return hero
 
+# ---------- saída incremental ----------
+def page_id(fname: str) -> str:
+    """pageid do nome do arquivo ("Título__1234.wiki" -> "1234")."""
+    stem = fname[:-len(".wiki")]
+    return stem.rsplit("__", 1)[-1]
+
+def sha1_bytes(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+def builder_fingerprint() -> str:
+    """
+    Muda quando este script (build_hero...), o infobox_extract.py (extração dos
+    templates) ou o PARSE_VERSION mudam: aí o estado não vale mais.
+    """
+    h = hashlib.sha1(f"parse_version={PARSE_VERSION}\n".encode("utf-8"))
+    for path in (__file__, infobox_extract.__file__):
+        h.update(pathlib.Path(path).read_bytes())
+    return h.hexdigest()
+
+def dump_entry(hero: Dict[str, Any]) -> bytes:
+    """Um herói exatamente como json.dump(lista, indent=2) o escreveria dentro da lista."""
+    text = json.dumps(hero, ensure_ascii=False, indent=2)
+    return ("  " + text.replace("\n", "\n  ")).encode("utf-8")
+
+def load_state() -> Tuple[Dict[str, Dict[str, Any]], bytes]:
+    """
+    (pageid -> {file, sha1, start, end}, bytes do heroes-list.json atual), ou
+    ({}, b"") se o estado não existe ou não corresponde mais ao arquivo de saída.
+    """
+    try:
+        with open(STATE_JSON, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        out = pathlib.Path(OUT_JSON).read_bytes()
+    except (OSError, ValueError):
+        print("[incremental] sem estado anterior; reconstruindo tudo")
+        return {}, b""
+    if state.get("builder") != builder_fingerprint():
+        print("[incremental] build_heroes_json.py mudou; reconstruindo tudo")
+        return {}, b""
+    if state.get("out_sha1") != sha1_bytes(out):
+        print(f"[incremental] {OUT_JSON} foi alterado fora do builder; reconstruindo tudo")
+        return {}, b""
+    return state["pages"], out
+
+def write_output(entries: List[Tuple[str, str, str, Optional[bytes]]]):
+    """
+    Monta o heroes-list.json a partir dos trechos (pageid, arquivo, sha1, bytes ou None)
+    e grava junto o estado com a posição de cada herói no arquivo.
+    """
+    chunks = [b"[\n"]
+    pos = len(chunks[0])
+    pages: Dict[str, Dict[str, Any]] = {}
+    for pid, fname, sha, chunk in entries:
+        if chunk is None:
+            pages[pid] = {"file": fname, "sha1": sha, "start": None, "end": None}
+            continue
+        if len(chunks) > 1:
+            chunks.append(b",\n")
+            pos += 2
+        chunks.append(chunk)
+        pages[pid] = {"file": fname, "sha1": sha, "start": pos, "end": pos + len(chunk)}
+        pos += len(chunk)
+    data = b"".join(chunks) + b"\n]" if len(chunks) > 1 else b"[]"
+
+    for path, payload in ((OUT_JSON, data),
+                          (STATE_JSON, json.dumps({"builder": builder_fingerprint(),
+                                                   "out_sha1": sha1_bytes(data),
+                                                   "pages": pages}).encode("utf-8"))):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Gera heroes-list.json a partir dos .wiki de heróis.")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="processos para parsear as páginas (0 = todos os núcleos)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignora o parse cache (feh_wiki_dump/.parse-cache.sqlite)")
+    ap.add_argument("--incremental", action="store_true",
+                    help="reparseia só páginas novas/alteradas/removidas e encaixa no heroes-list.json existente")
+    return ap.parse_args()
+
 def main():
+    args = parse_args()
     if not os.path.isdir(HERO_PAGES_DIR):
         raise SystemExit(f"Pasta não encontrada: {HERO_PAGES_DIR}")
 
-    heroes: List[Dict[str, Any]] = []
     files = [f for f in os.listdir(HERO_PAGES_DIR) if f.endswith(".wiki")]
     files.sort(key=str.lower)
 
+    texts: Dict[str, str] = {}
+    hashes: Dict[str, str] = {}
     for fname in files:
-        path = os.path.join(HERO_PAGES_DIR, fname)
         try:
-            text = pathlib.Path(path).read_text(encoding="utf-8")
+            texts[fname] = pathlib.Path(os.path.join(HERO_PAGES_DIR, fname)).read_text(encoding="utf-8")
         except Exception as e:
             print(f"[skip] erro lendo {fname}: {e}")
             continue
+        hashes[fname] = sha1_bytes(texts[fname].encode("utf-8"))
+
+    # --incremental: página com mesmo pageid, arquivo e sha1 reaproveita o trecho já escrito
+    old_pages, old_out = load_state() if args.incremental else ({}, b"")
+    reused: Dict[str, Dict[str, Any]] = {}
+    for fname in texts:
+        old = old_pages.get(page_id(fname))
+        if old and old["file"] == fname and old["sha1"] == hashes[fname]:
+            reused[fname] = old
+    current_ids = {page_id(f) for f in texts}
+    removed = [e["file"] for pid, e in old_pages.items() if pid not in current_ids]
+    todo = [f for f in texts if f not in reused]
+    if args.incremental:
+        for fname in removed:
+            print(f"[removido] {fname}")
+        print(f"[incremental] {len(reused)} páginas sem mudança, {len(todo)} para parsear, {len(removed)} removidas")
+        if old_out and not todo and not removed:
+            print(f"\nNada mudou: {OUT_JSON}")
+            return
+
+    # consulta o cache aqui; só as páginas novas/alteradas vão para a extração
+    cache = open_cache("heroes", PARSE_VERSION, enabled=not args.no_cache)
+    params: Dict[str, Any] = {}
+    for fname in todo:
+        if cache:
+            found, value = cache.get(texts[fname])
+            if found:
+                params[fname] = value
+    missing = [f for f in todo if f not in params]
 
-        hero = parse_hero_wikitext(text)
-        if hero is None:
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if jobs > 1 and len(missing) > 1:
+        # map() preserva a ordem de `missing`, então a saída é a mesma da versão serial
+        chunksize = max(1, len(missing) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            extracted = list(pool.map(extract_hero_params, [texts[f] for f in missing], chunksize=chunksize))
+    else:
+        extracted = [extract_hero_params(texts[f]) for f in missing]
+    for fname, value in zip(missing, extracted):
+        params[fname] = value
+        if cache:
+            cache.put(texts[fname], value)
+
+    entries: List[Tuple[str, str, str, Optional[bytes]]] = []
+    for fname in texts:
+        old = reused.get(fname)
+        if old is not None:
+            chunk = old_out[old["start"]:old["end"]] if old["start"] is not None else None
+            entries.append((page_id(fname), fname, hashes[fname], chunk))
+            continue
+        if params[fname] is None:
+            entries.append((page_id(fname), fname, hashes[fname], None))
             continue
+        hero = build_hero(params[fname])
 
         # fallback de nome caso vazio
         if not hero["infobox"]["Name"]:
             hero["infobox"]["Name"] = fname.split("__")[0]
 
-        heroes.append(hero)
+        entries.append((page_id(fname), fname, hashes[fname], dump_entry(hero)))
         print(f"[ok] {fname} -> {hero['infobox']['Name']}")
 
-    with open(OUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(heroes, f, ensure_ascii=False, indent=2)
+    write_output(entries)
 
-    print(f"\nGerado: {OUT_JSON} ({len(heroes)} heróis)")
+    count = sum(1 for e in entries if e[3] is not None)
+    print(f"\nGerado: {OUT_JSON} ({count} heróis)")
+    if cache:
+        cache.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,88 @@
+# build_skills_json.py
+# Gera weapons/passives/assists/specials-list.json numa passada só pelo corpus de Skills:
+# cada página é lida e parseada uma vez e vai direto para o builder do seu tipo
+# (parse_weapon_file, parse_passive_file, ...). Saída idêntica à dos quatro build_*_json.py,
+# e o parse cache (parse_cache.py) é o mesmo deles: o que um já parseou o outro reaproveita.
+# Uso:
+#   python build_skills_json.py              # pastas Skills/pages/<Tipo> (split_skill_pages.py)
+#   python build_skills_json.py --manifest   # Skills/pages.ndjson via manifest.json, leitura sequencial
+# Requer: pip install mwparserfromhell
+
+import os
+import json
+import time
+import argparse
+from typing import Any, Dict, List, Tuple
+from parse_cache import open_cache
+from skill_pages import SKILL_PAGES_DIR, MANIFEST_JSON, iter_dir_pages, manifest_pages
+
+import build_weapons_json
+import build_passives_json
+import build_assists_json
+import build_specials_json
+
+# tipo -> (função de parse, arquivo de saída, template exigido, chave do objeto, campo do nome, módulo)
+BUILDERS = {
+    "Weapons": (build_weapons_json.parse_weapon_file, build_weapons_json.OUT_JSON, "Weapon Infobox", "Weapon", "Name", build_weapons_json),
+    "Passives": (build_passives_json.parse_passive_file, build_passives_json.OUT_JSON, "Passive", "Passive", "name", build_passives_json),
+    "Assists": (build_assists_json.parse_assist_file, build_assists_json.OUT_JSON, "Assist", "Assist", "name", build_assists_json),
+    "Specials": (build_specials_json.parse_special_file, build_specials_json.OUT_JSON, "Special", "Special", "Name", build_specials_json),
+}
+
+def iter_dir_corpus():
+    """(tipo, nome do arquivo, wikitext) de Skills/pages/<Tipo>/*.wiki, na ordem dos builders."""
+    for kind in BUILDERS:
+        folder = os.path.join(SKILL_PAGES_DIR, kind)
+        if not os.path.isdir(folder):
+            print(f"[skip] pasta não encontrada: {folder}")
+            continue
+        for fname, text in iter_dir_pages(folder):
+            yield kind, fname, text
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Gera as quatro listas de skills numa passada só.")
+    ap.add_argument("--manifest", nargs="?", const=MANIFEST_JSON, metavar="PATH",
+                    help="lê as páginas do pages.ndjson via manifest.json (padrão: feh_wiki_dump/Skills/manifest.json)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignora o parse cache (feh_wiki_dump/.parse-cache.sqlite)")
+    return ap.parse_args()
+
+def main():
+    args = parse_args()
+    t0 = time.perf_counter()
+    # manifesto: pages.ndjson lido de ponta a ponta uma única vez; desatualizado, volta às pastas
+    corpus = manifest_pages(args.manifest, BUILDERS) if args.manifest else None
+    if corpus is None:
+        corpus = iter_dir_corpus()
+
+    # agrupa por tipo: cada tipo usa o cache (namespace/versão) do seu builder, um de cada vez
+    pages: Dict[str, List[Tuple[str, str]]] = {kind: [] for kind in BUILDERS}
+    for kind, fname, text in corpus:
+        pages[kind].append((fname, text))
+
+    results: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {kind: [] for kind in BUILDERS}
+    for kind, items in pages.items():
+        parse_file, _, template, key, name_field, module = BUILDERS[kind]
+        cache = open_cache(kind.lower(), module.PARSE_VERSION, enabled=not args.no_cache)
+        for fname, text in items:
+            obj = parse_file(text, fname.split("__")[0], cache)
+            if obj is None:
+                print(f"[skip] sem template {{{template}}}: {fname}")
+                continue
+            results[kind].append((fname, obj))
+            print(f"[ok] {kind} :: {fname} -> {obj[key][name_field]}")
+        if cache:
+            cache.close()
+
+    print()
+    for kind, items in results.items():
+        # mesma ordem dos builders (nome do arquivo, sem caixa), qualquer que seja a ordem de leitura
+        items.sort(key=lambda item: item[0].lower())
+        out_json = BUILDERS[kind][1]
+        with open(out_json, "w", encoding="utf-8") as f:
+            json.dump([obj for _, obj in items], f, ensure_ascii=False, indent=2)
+        print(f"Gerado: {out_json} ({len(items)} {kind.lower()})")
+    print(f"Concluído em {time.perf_counter() - t0:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,26 @@
 # build_specials_json.py
 # Gera specials-list.json a partir dos .wiki em feh_wiki_dump/Skills/pages/Specials
+# (ou, com --manifest, direto do Skills/pages.ndjson via manifest.json do split_skill_pages.py)
 # Requer: pip install mwparserfromhell
 
 import os
 import json
-import pathlib
+import argparse
 import re
 from typing import Dict, Any, List, Optional
-import mwparserfromhell as mw
+from parse_cache import open_cache
+from infobox_extract import extract_template, extract_inner_args_from_template_value
+from skill_pages import MANIFEST_JSON, kind_pages
 
 BASE_DIR = os.path.dirname(__file__)
 SPECIALS_DIR = os.path.join(BASE_DIR, "feh_wiki_dump", "Skills", "pages", "Specials")
 OUT_JSON = os.path.join(BASE_DIR, "specials-list.json")
+PARSE_VERSION = 1  # suba ao mudar o que extract_special_params devolve (invalida o parse cache)
 
 # ------------- helpers -------------
 def clean_str(s: Optional[str]) -> str:
     return (str(s).strip() if s is not None else "")
 
-def tpl_name(t) -> str:
-    return str(t.name).strip().lower()
-
-def params_to_dict(t) -> Dict[str, str]:
-    d: Dict[str, str] = {}
-    for p in t.params:
-        d[str(p.name).strip()] = str(p.value).strip()
-    return d
-
-def get_template(parsed, wanted: str):
-    wl = wanted.strip().lower()
-    for t in parsed.filter_templates():
-        if tpl_name(t) == wl:
-            return t
-    return None
-
 def strip_links(text: str) -> str:
     # [[x|y]] -> y ; [[x]] -> x
     # remove '''bold'''/''italic''
@@ -43,34 +31,6 @@ def strip_links(text: str) -> str:
     text = text.replace("'''", "").replace("''", "")
     return text.strip()
 
-def extract_inner_args_from_template_value(val: str, allowed=("movelist","weaponlist")) -> str:
-    """
-    Converte "{{MoveList|all}}" -> "all"
-             "{{WeaponList|exclude=Staff}}" -> "exclude=Staff"
-             "Close" -> "Close"
-    Mantém como string limpa quando não for template suportado.
-    """
-    if not val:
-        return ""
-    parsed = mw.parse(val)
-    tmpls = [t for t in parsed.filter_templates() if tpl_name(t) in allowed]
-    if not tmpls:
-        # não é template esperado; devolve texto sem chaves
-        return val.strip().strip("{} ").strip()
-    t = tmpls[0]
-    # monta args: posicionais e/ou nomeados
-    if len(t.params) == 0:
-        return ""
-    parts: List[str] = []
-    for p in t.params:
-        name = str(p.name).strip()
-        value = str(p.value).strip()
-        if name.isdigit():
-            parts.append(value)
-        else:
-            parts.append(f"{name}={value}")
-    return ", ".join(parts)
-
 def build_special_object(sdict: Dict[str, str], fallback_name: str) -> Dict[str, Any]:
     name = clean_str(sdict.get("name")) or fallback_name
     charge = clean_str(sdict.get("charge"))
@@ -97,31 +57,32 @@ def build_special_object(sdict: Dict[str, str], fallback_name: str) -> Dict[str,
     }
 
 # ------------- pipeline -------------
-def parse_special_file(text: str, fallback_name: str) -> Optional[Dict[str, Any]]:
-    parsed = mw.parse(text)
-    spec = get_template(parsed, "Special")
-    if not spec:
-        return None
-    sdict = params_to_dict(spec)
-    return build_special_object(sdict, fallback_name)
+def extract_special_params(text: str) -> Optional[Dict[str, str]]:
+    """Parâmetros do {{Special}} (ou None); é o que fica no parse cache."""
+    return extract_template(text, "Special")
+
+def parse_special_file(text: str, fallback_name: str, cache=None) -> Optional[Dict[str, Any]]:
+    sdict = cache.fetch(text, lambda: extract_special_params(text)) if cache else extract_special_params(text)
+    return build_special_object(sdict, fallback_name) if sdict is not None else None
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Gera specials-list.json a partir das páginas de Specials.")
+    ap.add_argument("--manifest", nargs="?", const=MANIFEST_JSON, metavar="PATH",
+                    help="lê as páginas do pages.ndjson via manifest.json (padrão: feh_wiki_dump/Skills/manifest.json)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignora o parse cache (feh_wiki_dump/.parse-cache.sqlite)")
+    return ap.parse_args()
 
 def main():
-    if not os.path.isdir(SPECIALS_DIR):
-        raise SystemExit(f"Pasta não encontrada: {SPECIALS_DIR}")
+    args = parse_args()
+    cache = open_cache("specials", PARSE_VERSION, enabled=not args.no_cache)
+    pages = kind_pages("Specials", SPECIALS_DIR, args.manifest)
 
     specials: List[Dict[str, Any]] = []
-    files = sorted([f for f in os.listdir(SPECIALS_DIR) if f.endswith(".wiki")], key=str.lower)
-
-    for fname in files:
-        path = os.path.join(SPECIALS_DIR, fname)
-        try:
-            text = pathlib.Path(path).read_text(encoding="utf-8")
-        except Exception as e:
-            print(f"[skip] erro lendo {fname}: {e}")
-            continue
 
+    for fname, text in pages:
         fallback_name = fname.split("__")[0]  # usa título do arquivo se não houver |name=
-        obj = parse_special_file(text, fallback_name)
+        obj = parse_special_file(text, fallback_name, cache)
         if obj is None:
             print(f"[skip] sem template {{Special}}: {fname}")
             continue
@@ -133,6 +94,8 @@ def main():
         json.dump(specials, f, ensure_ascii=False, indent=2)
 
     print(f"\nGerado: {OUT_JSON} ({len(specials)} specials)")
+    if cache:
+        cache.close()
 
 if __name__ == "__main__":
     main()
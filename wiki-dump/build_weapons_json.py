@@ -1,38 +1,26 @@
 # build_weapons_json.py
 # Gera weapons-list.json a partir dos .wiki em feh_wiki_dump/Skills/pages/Weapons
+# (ou, com --manifest, direto do Skills/pages.ndjson via manifest.json do split_skill_pages.py)
 # Requer: pip install mwparserfromhell
 
 import os
 import json
-import pathlib
+import argparse
 import re
 from typing import Dict, Any, List, Optional
-import mwparserfromhell as mw
+from parse_cache import open_cache
+from infobox_extract import extract_template, extract_inner_args_from_template_value
+from skill_pages import MANIFEST_JSON, kind_pages
 
 BASE_DIR = os.path.dirname(__file__)
 WEAPONS_DIR = os.path.join(BASE_DIR, "feh_wiki_dump", "Skills", "pages", "Weapons")
 OUT_JSON = os.path.join(BASE_DIR, "weapons-list.json")
+PARSE_VERSION = 1  # suba ao mudar o que extract_weapon_params devolve (invalida o parse cache)
 
 # ---------------- helpers ----------------
 def clean_str(s: Optional[str]) -> str:
     return (str(s).strip() if s is not None else "")
 
-def tpl_name(t) -> str:
-    return str(t.name).strip().lower()
-
-def params_to_dict(t) -> Dict[str, str]:
-    d: Dict[str, str] = {}
-    for p in t.params:
-        d[str(p.name).strip()] = str(p.value).strip()
-    return d
-
-def get_template(parsed, wanted: str):
-    wl = wanted.strip().lower()
-    for t in parsed.filter_templates():
-        if tpl_name(t) == wl:
-            return t
-    return None
-
 def strip_links_and_html(text: str) -> str:
     """Remove [[links]] e converte <br> em quebras de linha; tira ''/'''."""
     if not text:
@@ -49,29 +37,6 @@ def strip_links_and_html(text: str) -> str:
     text = re.sub(r"\n{3,}", "\n\n", text).strip()
     return text
 
-def extract_inner_args_from_template_value(val: str, allowed=("movelist","weaponlist")) -> str:
-    """
-    "{{MoveList|all}}"             -> "all"
-    "{{WeaponList|exclude=Staff}}" -> "exclude=Staff"
-    "Close"                        -> "Close"
-    """
-    if not val:
-        return ""
-    parsed = mw.parse(val)
-    tmpls = [t for t in parsed.filter_templates() if tpl_name(t) in allowed]
-    if not tmpls:
-        return val.strip().strip("{} ").strip()
-    t = tmpls[0]
-    parts: List[str] = []
-    for p in t.params:
-        name = str(p.name).strip()
-        value = str(p.value).strip()
-        if name.isdigit():
-            parts.append(value)
-        else:
-            parts.append(f"{name}={value}")
-    return ", ".join(parts)
-
 def parse_stat_modifiers(s: str) -> Dict[str, str]:
     """
     "0,14,3,0,0" -> {"HP":"0","ATK":"14","SPD":"3","DEF":"0","RES":"0"}
@@ -163,31 +128,32 @@ def build_weapon_object(wdict: Dict[str, str], fallback_name: str) -> Dict[str,
     }
 
 # ---------------- pipeline ----------------
-def parse_weapon_file(text: str, fallback_name: str) -> Optional[Dict[str, Any]]:
-    parsed = mw.parse(text)
-    tpl = get_template(parsed, "Weapon Infobox")
-    if not tpl:
-        return None
-    wdict = params_to_dict(tpl)
-    return build_weapon_object(wdict, fallback_name)
+def extract_weapon_params(text: str) -> Optional[Dict[str, str]]:
+    """Parâmetros do {{Weapon Infobox}} (ou None); é o que fica no parse cache."""
+    return extract_template(text, "Weapon Infobox")
+
+def parse_weapon_file(text: str, fallback_name: str, cache=None) -> Optional[Dict[str, Any]]:
+    wdict = cache.fetch(text, lambda: extract_weapon_params(text)) if cache else extract_weapon_params(text)
+    return build_weapon_object(wdict, fallback_name) if wdict is not None else None
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Gera weapons-list.json a partir das páginas de Weapons.")
+    ap.add_argument("--manifest", nargs="?", const=MANIFEST_JSON, metavar="PATH",
+                    help="lê as páginas do pages.ndjson via manifest.json (padrão: feh_wiki_dump/Skills/manifest.json)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignora o parse cache (feh_wiki_dump/.parse-cache.sqlite)")
+    return ap.parse_args()
 
 def main():
-    if not os.path.isdir(WEAPONS_DIR):
-        raise SystemExit(f"Pasta não encontrada: {WEAPONS_DIR}")
+    args = parse_args()
+    cache = open_cache("weapons", PARSE_VERSION, enabled=not args.no_cache)
+    pages = kind_pages("Weapons", WEAPONS_DIR, args.manifest)
 
     weapons: List[Dict[str, Any]] = []
-    files = sorted([f for f in os.listdir(WEAPONS_DIR) if f.endswith(".wiki")], key=str.lower)
-
-    for fname in files:
-        path = os.path.join(WEAPONS_DIR, fname)
-        try:
-            text = pathlib.Path(path).read_text(encoding="utf-8")
-        except Exception as e:
-            print(f"[skip] erro lendo {fname}: {e}")
-            continue
 
+    for fname, text in pages:
         fallback_name = fname.split("__")[0]
-        obj = parse_weapon_file(text, fallback_name)
+        obj = parse_weapon_file(text, fallback_name, cache)
         if obj is None:
             print(f"[skip] sem template {{Weapon Infobox}}: {fname}")
             continue
@@ -199,6 +165,8 @@ def main():
         json.dump(weapons, f, ensure_ascii=False, indent=2)
 
     print(f"\nGerado: {OUT_JSON} ({len(weapons)} weapons)")
+    if cache:
+        cache.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,228 @@
+# infobox_extract.py
+# Leitura rápida dos parâmetros de templates "planos" (Hero Infobox, Weapon Infobox,
+# Passive, Assist, Special, tabelas de skills do herói...) sem montar a árvore do
+# mwparserfromhell. Devolve os mesmos dicts que get_template + params_to_dict dos
+# build_*_json.py; quando o texto tem algo que só o parser completo resolve
+# (<nowiki>, {{{arg}}}, colchetes desbalanceados...), cai no mw.parse.
+# Uso:
+#   python infobox_extract.py   # compara com o mwparserfromhell em todo o feh_wiki_dump e mede o tempo
+# Requer: pip install mwparserfromhell
+
+import os
+import re
+import sys
+import time
+import pathlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+import mwparserfromhell as mw
+
+BASE_DIR = os.path.dirname(__file__)
+DUMP_DIR = os.path.join(BASE_DIR, "feh_wiki_dump")
+
+# tokens que importam dentro de um template; <br> é o único tag que não exige o parser completo.
+# nowiki/pre/... escondem templates em qualquer profundidade; "[http..." é link externo,
+# e o "|" dentro dele não separa parâmetros
+RE_TOKEN = re.compile(
+    r"\{\{\{|\{\{|\}\}|\[\[|\]\]|\[(?=https?:|ftps?:|mailto:|irc:|ircs:|news:|//)|\||=|<!--|''|\n\{\||"
+    r"<(?:nowiki|pre|source|syntaxhighlight|math|includeonly|noinclude|onlyinclude)\b|<(?!br\b)/?[a-z]",
+    re.I)
+RAW_TAGS = ("<nowiki", "<pre", "<source", "<syntaxhighlight", "<math",
+            "<includeonly", "<noinclude", "<onlyinclude")
+RE_BAD_NAME = re.compile(r"[{}\[\]<>]")
+RE_QUOTES = re.compile(r"'{2,}")
+RE_LINK_TITLE = re.compile(r"[^\n|\[\]{}<>]*(?:\||\]\])")
+RE_SPAN_END = re.compile(r"\n|\||\{\{|\}\}|\[\[|\]\]")
+
+Params = Dict[str, str]
+
+AMBIGUOUS = None
+
+def finish_params(text: str, segments) -> Params:
+    """(início, fim, posição do '=' ou -1) de cada parâmetro -> dict como o params_to_dict."""
+    d: Params = {}
+    positional = 0
+    for start, end, eq in segments:
+        if eq < 0:
+            positional += 1
+            d[str(positional)] = text[start:end].strip()
+        else:
+            d[text[start:eq].strip()] = text[eq + 1:end].strip()
+    return d
+
+def quotes_balanced(text: str, start: int, end: int) -> bool:
+    """Itálico ('') e negrito (''') abrem e fecham dentro de text[start:end]?"""
+    italic = bold = False
+    for q in RE_QUOTES.finditer(text, start, end):
+        n = len(q.group(0))
+        if n == 2 or n >= 5:
+            italic = not italic
+        if n >= 3:
+            bold = not bold
+    return not italic and not bold
+
+def scan_templates(wikitext: str, names: Sequence[str]):
+    """
+    {nome: parâmetros ou None} para cada nome pedido, pegando (como o
+    get_template) o primeiro template com aquele nome na ordem em que abrem,
+    em qualquer profundidade. AMBIGUOUS quando só o parser completo sabe responder.
+    """
+    wanted = {n.strip().lower(): n for n in names}
+    found: Dict[str, tuple] = {}  # nome pedido -> (posição do "{{", segmentos)
+    # pilha: ["t", início, nome, segmentos, início do segmento, '='] ou ["l"] para [[links]]
+    stack = []
+    links = 0
+    pos = 0
+    search = RE_TOKEN.search
+    while True:
+        m = search(wikitext, pos)
+        if not m:
+            break
+        tok = m.group(0)
+        pos = m.end()
+        if tok == "{{":
+            stack.append(["t", m.start(), None, [], pos, -1])
+        elif tok == "|" or tok == "}}":
+            if not stack:
+                continue
+            top = stack[-1]
+            if top[0] == "l":
+                if tok == "}}":
+                    return AMBIGUOUS
+                continue
+            if top[2] is None:
+                raw = wikitext[top[4]:m.start()]
+                name = raw.strip()
+                if not name or "\n" in name or RE_BAD_NAME.search(name):
+                    return AMBIGUOUS
+                top[2] = name.lower()
+            else:
+                top[3].append((top[4], m.start(), top[5]))
+            top[4] = pos
+            top[5] = -1
+            if tok == "}}":
+                stack.pop()
+                key = wanted.get(top[2])
+                if key is not None and (key not in found or top[1] < found[key][0]):
+                    found[key] = (top[1], top[3])
+                # tudo achado e nenhum ancestral aberto com nome pedido: nada mais muda a resposta
+                if len(found) == len(wanted) and not any(
+                        f[0] == "t" and f[2] in wanted for f in stack):
+                    break
+        elif tok == "=":
+            if stack:
+                top = stack[-1]
+                if top[0] == "t" and top[2] is not None and top[5] < 0:
+                    if m.start() > 0 and wikitext[m.start() - 1] == "\n":
+                        return AMBIGUOUS  # "\n==título==": o mw lê como seção, não como chave=valor
+                    top[5] = m.start()
+        elif tok == "[[":
+            if stack:
+                if not RE_LINK_TITLE.match(wikitext, pos):
+                    return AMBIGUOUS  # título inválido (quebra de linha, {{...}}): o mw não vê link
+                stack.append(["l"])
+                links += 1
+        elif tok == "]]":
+            if stack and stack[-1][0] == "l":
+                stack.pop()
+                links -= 1
+            elif links:
+                return AMBIGUOUS
+        elif tok == "<!--":
+            end = wikitext.find("-->", pos)
+            if end < 0:
+                return AMBIGUOUS
+            pos = end + 3
+        elif tok == "''" and stack and stack[-1][0] == "t":
+            # só é seguro se fechar no mesmo trecho (até |, }}, [[ ou fim da linha);
+            # senão o mw pode descartar o template inteiro
+            start = max(stack[-1][4], wikitext.rfind("\n", 0, m.start()) + 1)
+            e = RE_SPAN_END.search(wikitext, m.start())
+            end = e.start() if e else len(wikitext)
+            if not quotes_balanced(wikitext, start, end):
+                return AMBIGUOUS
+            if stack[-1][5] < 0 and "=" in wikitext[start:end]:
+                return AMBIGUOUS  # '''a=b''' antes do "=" da chave: o "=" fica dentro do negrito
+        elif tok == "{{{":
+            return AMBIGUOUS  # {{{arg}}} / {{{{...: o mwparserfromhell resolve de outro jeito
+        elif tok.lower() in RAW_TAGS:
+            return AMBIGUOUS  # conteúdo que o mw não lê como wikitext, dentro ou fora de template
+        elif tok == "[":
+            if stack:
+                return AMBIGUOUS  # [http://... a|b]: o "|" fica no link
+        elif stack:
+            # dentro de template: tags, tabelas e aspas dentro de [[links]] mudam onde
+            # o mw corta os parâmetros
+            return AMBIGUOUS
+    if stack and len(found) < len(wanted):
+        return AMBIGUOUS
+    return {n: (finish_params(wikitext, found[n][1]) if n in found else None) for n in names}
+
+def full_templates(wikitext: str, names: Sequence[str]) -> Dict[str, Optional[Params]]:
+    """O mesmo que scan_templates, pelo parse completo (get_template + params_to_dict)."""
+    out: Dict[str, Optional[Params]] = {n: None for n in names}
+    wanted = {n.strip().lower(): n for n in names}
+    for tpl in mw.parse(wikitext).filter_templates():
+        key = wanted.get(str(tpl.name).strip().lower())
+        if key is not None and out[key] is None:
+            out[key] = {str(p.name).strip(): str(p.value).strip() for p in tpl.params}
+    return out
+
+def extract_templates(wikitext: str, names: Sequence[str]) -> Dict[str, Optional[Params]]:
+    """Parâmetros de cada template pedido (None se ausente): leitura rápida, com fallback."""
+    res = scan_templates(wikitext, names)
+    return full_templates(wikitext, names) if res is AMBIGUOUS else res
+
+def extract_template(wikitext: str, name: str) -> Optional[Params]:
+    return extract_templates(wikitext, (name,))[name]
+
+# ---------- Valores de parâmetro ----------
+@lru_cache(maxsize=None)  # poucos valores distintos ({{MoveList|all}} ...)
+def extract_inner_args_from_template_value(val: str, allowed=("movelist","weaponlist")) -> str:
+    """
+    "{{MoveList|all}}"             -> "all"
+    "{{WeaponList|exclude=Staff}}" -> "exclude=Staff"
+    "Close"                        -> "Close"
+    """
+    if not val:
+        return ""
+    parsed = mw.parse(val)
+    tmpls = [t for t in parsed.filter_templates() if str(t.name).strip().lower() in allowed]
+    if not tmpls:
+        return val.strip().strip("{} ").strip()
+    parts: List[str] = []
+    for p in tmpls[0].params:
+        name = str(p.name).strip()
+        value = str(p.value).strip()
+        parts.append(value if name.isdigit() else f"{name}={value}")
+    return ", ".join(parts)
+
+# ---------- Teste diferencial / benchmark ----------
+CHECKS = {
+    "Heroes": ("Hero Infobox", "Stats Page", "Weapons Table",
+               "Assists Table", "Specials Table", "Passives Table"),
+    "Skills": ("Weapon Infobox", "Passive", "Assist", "Special"),
+}
+
+def check(base: str = DUMP_DIR):
+    """Compara com o mwparserfromhell em todos os .wiki do dump e mede os dois caminhos."""
+    for folder, names in CHECKS.items():
+        root = pathlib.Path(base, folder)
+        texts = [(fp.name, fp.read_text(encoding="utf-8")) for fp in sorted(root.rglob("*.wiki"))]
+        if not texts:
+            print(f"[skip] nenhum .wiki em {root}")
+            continue
+        t0 = time.perf_counter()
+        full = [full_templates(t, names) for _, t in texts]
+        t1 = time.perf_counter()
+        fast = [extract_templates(t, names) for _, t in texts]
+        t2 = time.perf_counter()
+        fallback = sum(scan_templates(t, names) is AMBIGUOUS for _, t in texts)
+        diffs = [fname for (fname, _), a, b in zip(texts, full, fast) if a != b]
+        print(f"{folder}: {len(texts)} páginas | parse completo {t1 - t0:.2f}s | leitura rápida {t2 - t1:.2f}s "
+              f"({(t1 - t0) / max(t2 - t1, 1e-9):.1f}x) | {fallback} no parser completo | {len(diffs)} divergências")
+        for fname in diffs[:10]:
+            print(f"  [diff] {fname}")
+
+if __name__ == "__main__":
+    check(sys.argv[1] if len(sys.argv) > 1 else DUMP_DIR)
@@ -0,0 +1,104 @@
+# parse_cache.py
+# Cache em disco (SQLite) do que os build_*_json.py extraem de cada página:
+# os dicts de parâmetros dos templates, indexados por sha1(conteúdo) + builder
+# + versão do extrator. Páginas que não mudaram pulam a extração.
+# Usado por build_heroes_json.py, build_weapons/passives/assists/specials_json.py
+# e build_skills_json.py (desligue com --no-cache).
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from typing import Any, Callable, Optional, Tuple
+
+BASE_DIR = os.path.dirname(__file__)
+CACHE_PATH = os.path.join(BASE_DIR, "feh_wiki_dump", ".parse-cache.sqlite")
+MAX_CACHE_MB = 64.0   # acima disso, remove as entradas usadas há mais tempo
+
+class ParseCache:
+    """
+    Uma instância por builder (namespace "heroes", "weapons"...); todas dividem
+    o mesmo arquivo. `version` entra na chave: ao mudar o que o extrator
+    devolve, suba a versão no builder e as entradas antigas deixam de bater
+    (e saem pela remoção por tamanho).
+    """
+    def __init__(self, namespace: str, version: int, path: str = CACHE_PATH,
+                 max_mb: float = MAX_CACHE_MB):
+        self.namespace = namespace
+        self.version = version
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.used: list[str] = []  # chaves lidas nesta execução (atualiza o LRU no close)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " size INTEGER NOT NULL, used REAL NOT NULL)")
+
+    def key(self, text: str) -> str:
+        h = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{self.version}:{h}"
+
+    def get(self, text: str) -> Tuple[bool, Any]:
+        """(achou?, valor). O valor pode ser None (página sem o template)."""
+        key = self.key(text)
+        row = self.db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self.used.append(key)
+        return True, json.loads(row[0])
+
+    def put(self, text: str, value: Any):
+        data = json.dumps(value, ensure_ascii=False)
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, used) VALUES (?, ?, ?, ?)",
+            (self.key(text), data, len(data.encode("utf-8")), time.time()))
+
+    def fetch(self, text: str, compute: Callable[[], Any]) -> Any:
+        """Valor do cache ou, se faltar, `compute()` (que é então gravado)."""
+        found, value = self.get(text)
+        if not found:
+            value = compute()
+            self.put(text, value)
+        return value
+
+    def evict(self):
+        """Remove as entradas menos usadas até o total ficar abaixo de max_bytes."""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self.db.execute("SELECT key, size FROM entries ORDER BY used"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self.db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.evicted += len(doomed)
+
+    def close(self):
+        now = time.time()
+        self.db.executemany("UPDATE entries SET used = ? WHERE key = ?", [(now, k) for k in self.used])
+        self.evict()
+        self.db.commit()
+        self.db.close()
+        print(self.summary())
+
+    def summary(self) -> str:
+        try:
+            size_mb = os.path.getsize(self.path) / (1024 * 1024)
+        except OSError:
+            size_mb = 0.0
+        return (f"[parse-cache] {self.namespace} v{self.version}: {self.hits} acertos, "
+                f"{self.misses} faltas, {self.evicted} removidos | {size_mb:.1f} MB em {self.path}")
+
+def open_cache(namespace: str, version: int, enabled: bool = True) -> Optional[ParseCache]:
+    """ParseCache do builder, ou None com --no-cache."""
+    return ParseCache(namespace, version) if enabled else None
@@ -1,6 +1,11 @@
 # pull-wiki-cats.py
-import os, re, json, time, pathlib, requests
+import os, re, json, time, pathlib, argparse, threading, hashlib, requests
 from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from wiki_common import (RETRY_HTTP_STATUS, RETRY_API_CODES, safe_filename,
+                         params_key, Cassette, backoff_delay)
 
 API = "https://feheroes.fandom.com/api.php"
 USER_AGENT = "FEH-Wiki-Dumper/1.2 (+local)"
@@ -14,35 +19,355 @@ ROOT_CATEGORIES = [
 
 OUT_DIR = "feh_wiki_dump"  # cria Heroes/, Weapons/, Skills/ aqui
 
+# list=recentchanges só guarda ~90 dias no MediaWiki ($wgRCMaxAge); para dumps
+# mais antigos que isso o modo incremental compara timestamps página a página.
+RC_MAX_AGE_DAYS = 85
+# margem no início do crawl gravado, para diferença de relógio com o servidor
+RC_CLOCK_SKEW_SECONDS = 300
+CRAWL_STATE_NAME = ".crawl-state.json"  # ao lado do pages.ndjson: início do crawl que o gerou
+
+# Cache da árvore de categorias + membros (evita o BFS a cada execução)
+CATEGORY_CACHE_DIR = os.path.join(OUT_DIR, ".category-cache")
+CATEGORY_CACHE_TTL_HOURS = 24.0
+
+# Cache de respostas da API (--http-cache), para execuções de desenvolvimento
+HTTP_CACHE_DIR = os.path.join(OUT_DIR, ".http-cache")
+HTTP_CACHE_TTL_SECONDS = 6 * 3600
+
+# Orçamento de requisições à API (compartilhado entre as threads)
+REQUESTS_PER_SECOND = 5.0   # equivale ao antigo sleep(0.2) entre chunks
+FETCH_WORKERS = 1           # chunks de conteúdo baixados em paralelo
+
+# Backoff: maxlag faz o servidor recusar requisições quando as réplicas estão
+# atrasadas; nesses casos (e em 429/5xx) o cliente espera e reduz o ritmo.
+MAXLAG_SECONDS = 5
+MAX_RETRIES = 8
+MIN_REQUESTS_PER_SECOND = 0.5
+
 session = requests.Session()
 session.headers.update({"User-Agent": USER_AGENT})
 
-# ---------- Sanitização Windows ----------
-INVALID_WIN_CHARS = r'[<>:"/\\|?*\x00-\x1F]'
-RESERVED_NAMES = {
-    "CON","PRN","AUX","NUL",
-    *{f"COM{i}" for i in range(1,10)},
-    *{f"LPT{i}" for i in range(1,10)},
-}
-def safe_filename(title: str, pageid: int, maxlen: int = 150) -> str:
-    name = re.sub(INVALID_WIN_CHARS, " ", title).strip()
-    name = re.sub(r"\s{2,}", " ", name)
-    name = name.rstrip(" .")
-    if name.upper() in RESERVED_NAMES or name == "":
-        name = f"page_{pageid}"
-    if len(name) > maxlen:
-        name = name[:maxlen].rstrip(" .")
-    return f"{name}__{pageid}.wiki"
+# ---------- Rate limit ----------
+class TokenBucket:
+    """
+    Token bucket thread-safe: no máximo `rate` requisições/s, com rajada de `burst`.
+    É adaptativo (AIMD): slow_down() corta o ritmo pela metade quando o servidor
+    reclama e speed_up() devolve aos poucos até `max_rate` enquanto ele responde
+    bem. pause() segura todas as threads (ex.: Retry-After).
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.rate <= 0:  # sem limite
+                    return
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def slow_down(self):
+        with self.lock:
+            if self.max_rate > 0:
+                self.rate = max(MIN_REQUESTS_PER_SECOND, self.rate / 2)
+
+    def speed_up(self):
+        with self.lock:
+            if 0 < self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+rate_limiter = TokenBucket(REQUESTS_PER_SECOND)
+
+def configure_client(api: str, rps: float, workers: int):
+    """Aplica as opções de linha de comando ao cliente HTTP global."""
+    global API, FETCH_WORKERS, rate_limiter
+    API = api
+    FETCH_WORKERS = max(1, workers)
+    rate_limiter = TokenBucket(rps, burst=FETCH_WORKERS)
+    # um slot de conexão por worker, para a Session ser reaproveitada sem descartes
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=FETCH_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+# ---------- Telemetria ----------
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000]
+
+class CrawlStats:
+    """Contadores da execução, exportados em JSON por --report."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.latency_total = 0.0
+        self.latency_hist = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # último = acima do maior bucket
+        self.retries = 0
+        self.errors: dict[str, int] = {}
+        self.bytes_received = 0
+        self.phases = {"category_expansion": 0.0, "content_fetch": 0.0, "disk_write": 0.0}
+        self.categories: dict[str, dict] = {}
+        self.files = {"written": 0, "unchanged": 0, "linked": 0}
+
+    def record_request(self, seconds: float, nbytes: int):
+        ms = seconds * 1000
+        bucket = next((i for i, b in enumerate(LATENCY_BUCKETS_MS) if ms <= b), len(LATENCY_BUCKETS_MS))
+        with self.lock:
+            self.requests += 1
+            self.latency_total += seconds
+            self.latency_hist[bucket] += 1
+            self.bytes_received += nbytes
+
+    def record_error(self, code: str, retried: bool):
+        with self.lock:
+            self.errors[code] = self.errors.get(code, 0) + 1
+            if retried:
+                self.retries += 1
+
+    def count_file(self, outcome: str):
+        with self.lock:
+            self.files[outcome] += 1
+
+    def add_phase(self, phase: str, seconds: float):
+        with self.lock:
+            self.phases[phase] += seconds
+
+    @contextmanager
+    def timed(self, phase: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(phase, time.perf_counter() - t0)
+
+    def record_category(self, root_cat: str, pages: int, downloaded: int, seconds: float):
+        self.categories[root_cat] = {
+            "pages": pages,
+            "downloaded": downloaded,
+            "seconds": round(seconds, 3),
+            "pages_per_sec": round(pages / seconds, 2) if seconds > 0 else None,
+        }
+
+    def report(self) -> dict:
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        rep = {
+            "total_seconds": round(time.perf_counter() - self.started, 3),
+            "requests": self.requests,
+            "latency_ms_avg": round(self.latency_total * 1000 / self.requests, 1) if self.requests else None,
+            "latency_ms_histogram": dict(zip(labels, self.latency_hist)),
+            "retries": self.retries,
+            "errors": self.errors,
+            "bytes_received": self.bytes_received,
+            "phases_seconds": {k: round(v, 3) for k, v in self.phases.items()},
+            "files": self.files,
+            "final_rps": rate_limiter.rate,
+            "categories": self.categories,
+        }
+        if http_cache:
+            rep["http_cache"] = {"hits": http_cache.hits, "revalidated": http_cache.revalidated,
+                                 "misses": http_cache.misses}
+        if cassette:
+            rep["cassette"] = {"mode": cassette.mode, "responses": cassette.count}
+        return rep
+
+stats = CrawlStats()
+
+# ---------- Cache HTTP ----------
+class ResponseCache:
+    """
+    Cache em disco das respostas do mw_get (um .json por requisição, em
+    subpastas pelos 2 primeiros hex da chave). Dentro de `ttl` segundos a
+    resposta é servida sem rede; depois disso, se o servidor mandou
+    ETag/Last-Modified, a entrada é revalidada com requisição condicional
+    (304 -> reaproveita), senão é baixada de novo.
+    """
+    # consultas que dependem do "agora" não podem ser reaproveitadas
+    UNCACHEABLE_LISTS = {"recentchanges"}
+
+    def __init__(self, root: str, ttl: float):
+        self.root = root
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def cacheable(self, params: dict) -> bool:
+        return params.get("list") not in self.UNCACHEABLE_LISTS
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".json")
+
+    def lookup(self, params: dict) -> dict | None:
+        try:
+            with open(self._path(params_key(params)), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("stored_at", 0) < self.ttl
+
+    def conditional_headers(self, entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, params: dict, data: dict, resp_headers=None):
+        resp_headers = resp_headers or {}
+        path = self._path(params_key(params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "stored_at": time.time(),
+                "etag": resp_headers.get("ETag"),
+                "last_modified": resp_headers.get("Last-Modified"),
+                "params": params,
+                "data": data,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def count(self, field: str):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def summary(self) -> str:
+        return f"[http-cache] hits={self.hits} revalidados={self.revalidated} misses={self.misses}"
+
+http_cache: ResponseCache | None = None  # ativado por --http-cache
+
+# ---------- Gravação / replay ----------
+cassette: Cassette | None = None  # ativado por --record / --replay
+
+# ---------- Poda de páginas de heróis ----------
+# build_heroes_json.py só lê estes templates; citações, trivia, galerias etc.
+# podem ser descartados já no dump (--trim-heroes).
+HERO_TEMPLATES = (
+    "hero infobox", "stats page",
+    "weapons table", "assists table", "specials table", "passives table",
+)
+RE_TEMPLATE_TOKEN = re.compile(r"<!--.*?-->|\{\{|\}\}", re.S)
+RE_HERO_TEMPLATE = re.compile(
+    r"\{\{\s*(?:" + "|".join(re.escape(n) for n in HERO_TEMPLATES) + r")\s*(?:\||\}\})", re.I)
+
+def top_level_templates(text: str):
+    """Gera (início, fim) de cada {{...}} de nível 0, ignorando <!-- comentários -->."""
+    depth = 0
+    start = 0
+    for m in RE_TEMPLATE_TOKEN.finditer(text):
+        tok = m.group(0)
+        if tok == "{{":
+            if depth == 0:
+                start = m.start()
+            depth += 1
+        elif tok == "}}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield start, m.end()
+
+def trim_hero_wikitext(wikitext: str) -> str:
+    """
+    Mantém só os blocos {{...}} de nível 0 que são (ou contêm) um dos
+    HERO_TEMPLATES, na ordem original. O resultado é idempotente e dá o
+    mesmo heroes-list.json que a página inteira.
+    """
+    blocks = []
+    for a, b in top_level_templates(wikitext):
+        block = wikitext[a:b]
+        if RE_HERO_TEMPLATE.search(block):
+            blocks.append(block)
+    return "\n".join(blocks)
+
+# filtros de conteúdo por pasta de categoria, aplicados antes de gravar
+CONTENT_FILTERS = {}
 
 # ---------- Helpers de API ----------
+def throttle(attempt: int, retry_after: str | None = None):
+    """Servidor sobrecarregado: reduz o ritmo e pausa todas as threads."""
+    rate_limiter.slow_down()
+    rate_limiter.pause(backoff_delay(attempt, retry_after))
+
 def mw_get(params: dict):
-    for _ in range(5):
-        resp = session.get(API, params=params, timeout=60)
+    if cassette and cassette.mode == "replay":
+        return cassette.play(params)
+    data = fetch_api(params)
+    if cassette:
+        cassette.record(params, data)
+    return data
+
+def fetch_api(params: dict):
+    entry = None
+    if http_cache and http_cache.cacheable(params):
+        entry = http_cache.lookup(params)
+        if entry and http_cache.is_fresh(entry):
+            http_cache.count("hits")
+            return entry["data"]
+    headers = http_cache.conditional_headers(entry) if entry else {}
+    # maxlag vai só na requisição; chaves de cache/cassette usam os params originais
+    send = {**params, "maxlag": str(MAXLAG_SECONDS)}
+
+    for attempt in range(MAX_RETRIES):
+        rate_limiter.acquire()
+        t0 = time.perf_counter()
+        try:
+            resp = session.get(API, params=send, headers=headers, timeout=60)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            stats.record_error(type(e).__name__, retried=True)
+            throttle(attempt)
+            continue
+        stats.record_request(time.perf_counter() - t0, len(resp.content))
+        if resp.status_code in RETRY_HTTP_STATUS:
+            stats.record_error(f"http_{resp.status_code}", retried=True)
+            throttle(attempt, resp.headers.get("Retry-After"))
+            continue
+        if resp.status_code == 304 and entry:
+            rate_limiter.speed_up()
+            http_cache.count("revalidated")
+            http_cache.store(params, entry["data"], {
+                "ETag": entry.get("etag"), "Last-Modified": entry.get("last_modified"),
+            })
+            return entry["data"]
+        if resp.status_code >= 400:
+            stats.record_error(f"http_{resp.status_code}", retried=False)
         resp.raise_for_status()
         data = resp.json()
         if "error" in data:
-            time.sleep(1)
+            code = str(data["error"].get("code", "unknown"))
+            if code not in RETRY_API_CODES:
+                # badvalue, invalidtitle, missingtitle...: falha na hora
+                stats.record_error(code, retried=False)
+                raise RuntimeError(f"API error {code}: {data['error'].get('info', '')} ({params})")
+            stats.record_error(code, retried=True)
+            if code == "readonly":
+                time.sleep(backoff_delay(attempt))
+            else:
+                throttle(attempt, resp.headers.get("Retry-After"))
             continue
+        rate_limiter.speed_up()
+        if http_cache and http_cache.cacheable(params):
+            http_cache.count("misses")
+            http_cache.store(params, data, resp.headers)
         return data
     raise RuntimeError(f"API error: {params}")
 
@@ -101,8 +426,296 @@ def pages_in_category(cat: str) -> list[dict]:
             break
     return pages
 
+def crawl_category_tree(root_category: str) -> tuple[set[str], dict[str, list[dict]]]:
+    """
+    --single-query: subcategorias e páginas (ns=0) de cada categoria numa só
+    listagem (cmtype=page|subcat), em vez de uma consulta para cada tipo.
+    Retorna ({categoria raiz + subcategorias}, {categoria: [membros]}).
+    """
+    all_cats = set()
+    members: dict[str, list[dict]] = {}
+    q = deque([root_category])
+    while q:
+        cat = q.popleft()
+        if cat in all_cats:
+            continue
+        all_cats.add(cat)
+        pages = []
+        cont = {}
+        while True:
+            params = {
+                "action": "query",
+                "format": "json",
+                "list": "categorymembers",
+                "cmtitle": cat,
+                "cmnamespace": "0|14",
+                "cmtype": "page|subcat",
+                "cmlimit": "500",
+                **cont
+            }
+            data = mw_get(params)
+            for m in data.get("query", {}).get("categorymembers", []):
+                if m.get("ns") == 14:
+                    if m.get("title") and m["title"] not in all_cats:
+                        q.append(m["title"])
+                else:
+                    pages.append(m)
+            if "continue" in data:
+                cont = data["continue"]
+            else:
+                break
+        members[cat] = pages
+    return all_cats, members
+
+def fetch_content_chunk(chunk: list, by: str = "pageids",
+                        normalized: dict[str, str] | None = None) -> dict[int, dict]:
+    """
+    Busca wikitext da revisão atual de até 50 pageids (ou títulos, by="titles")
+    numa requisição. Com `normalized`, anota nele título pedido -> título
+    normalizado pela API (maiúscula inicial, "_" -> " "...).
+    """
+    out = {}
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        "prop": "revisions",
+        "rvprop": "content|timestamp",
+        by: "|".join(str(x) for x in chunk),
+    }
+    data = mw_get(params)
+    if normalized is not None:
+        for n in data.get("query", {}).get("normalized", []):
+            normalized[n["from"]] = n["to"]
+    for p in data.get("query", {}).get("pages", []):
+        if p.get("missing") or "pageid" not in p:
+            continue
+        revs = p.get("revisions", [])
+        content = revs[0].get("content", "") if revs else ""
+        ts = revs[0].get("timestamp") if revs else None
+        out[p["pageid"]] = {
+            "title": p.get("title",""),
+            "timestamp": ts,
+            "content": content
+        }
+    return out
+
+def iter_page_content(pageids: list[int]):
+    """
+    Gera (chunk, {pageid: página}) na ordem de `pageids`, chunks de 50 baixados
+    por até FETCH_WORKERS threads. O ritmo é ditado pelo rate_limiter do mw_get.
+    Só 2×FETCH_WORKERS chunks ficam em voo/memória por vez.
+    """
+    chunks = iter([pageids[i:i+50] for i in range(0, len(pageids), 50)])
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(fetch_content_chunk, chunk)))
+            if len(pending) >= 2 * FETCH_WORKERS:
+                break
+        while pending:
+            chunk, fut = pending.popleft()
+            with stats.timed("content_fetch"):  # só a espera pela rede, não o consumidor
+                part = fut.result()
+            nxt = next(chunks, None)
+            if nxt is not None:
+                pending.append((nxt, pool.submit(fetch_content_chunk, nxt)))
+            yield chunk, part
+
 def fetch_page_content(pageids: list[int]) -> dict[int, dict]:
-    """Busca wikitext da revisão atual por pageid."""
+    """Busca wikitext da revisão atual por pageid (mesma ordem de `pageids`)."""
+    out = {}
+    for _, part in iter_page_content(pageids):
+        out.update(part)
+    return out
+
+# ---------- Índice de apelidos ----------
+ALIASES_PATH = os.path.join(OUT_DIR, "aliases.json")
+
+def alias_key(name: str) -> str:
+    """Forma normalizada usada como chave em aliases.json (sem caixa, '_' = espaço)."""
+    return re.sub(r"\s+", " ", name.replace("_", " ")).strip().casefold()
+
+def fetch_redirects_chunk(chunk: list[int]) -> dict[int, list[str]]:
+    """Títulos de todos os redirects que apontam para até 50 pageids (segue o continue)."""
+    out: dict[int, list[str]] = {}
+    cont = {}
+    while True:
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "prop": "redirects",
+            "rdprop": "title",
+            "rdlimit": "max",
+            "pageids": "|".join(str(pid) for pid in chunk),
+            **cont
+        }
+        data = mw_get(params)
+        for p in data.get("query", {}).get("pages", []):
+            if "pageid" in p:
+                out.setdefault(p["pageid"], []).extend(r["title"] for r in p.get("redirects", []))
+        if "continue" in data:
+            cont = data["continue"]
+        else:
+            return out
+
+def build_alias_index() -> dict:
+    """
+    Monta feh_wiki_dump/aliases.json com todas as páginas já no dump:
+    {"aliases": {alias_key(nome): pageid}, "pages": {pageid: {"title", "folders"}}}.
+    Nomes aceitos, em ordem de prioridade: título canônico, redirects da wiki
+    e o nome de arquivo gerado por safe_filename. Em conflito, vence o de maior
+    prioridade (e, empatado, o primeiro a aparecer).
+    """
+    pages: dict[int, dict] = {}
+    for root_cat in ROOT_CATEGORIES:
+        folder = root_cat.replace("Category:", "")
+        for pid, meta in index_ndjson(os.path.join(OUT_DIR, folder, "pages.ndjson")).items():
+            entry = pages.setdefault(pid, {"title": meta["title"], "folders": []})
+            entry["folders"].append(folder)
+
+    pageids = list(pages)
+    redirects: dict[int, list[str]] = {}
+    with stats.timed("content_fetch"):
+        for i in range(0, len(pageids), 50):
+            redirects.update(fetch_redirects_chunk(pageids[i:i+50]))
+
+    ranked: dict[str, tuple[int, int]] = {}  # chave -> (prioridade, pageid)
+    conflicts = 0
+    def add(name: str, pid: int, rank: int):
+        nonlocal conflicts
+        key = alias_key(name)
+        if not key:
+            return
+        if key in ranked and ranked[key][1] != pid:
+            conflicts += 1
+            if ranked[key][0] <= rank:
+                return
+        ranked[key] = (rank, pid)
+    for pid, entry in pages.items():
+        add(entry["title"], pid, 0)
+    for pid in pageids:
+        for title in redirects.get(pid, []):
+            add(title, pid, 1)
+    for pid, entry in pages.items():
+        add(safe_filename(entry["title"], pid).split("__")[0], pid, 2)
+
+    index = {
+        "aliases": {key: pid for key, (_, pid) in sorted(ranked.items())},
+        "pages": {str(pid): pages[pid] for pid in sorted(pages)},
+    }
+    tmp_path = ALIASES_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    publish_file(tmp_path, ALIASES_PATH)
+    n_redirects = sum(len(v) for v in redirects.values())
+    print(f"[aliases] {len(ranked)} nomes -> {len(pages)} páginas "
+          f"({n_redirects} redirects, {conflicts} conflitos) em {ALIASES_PATH}")
+    return index
+
+# ---------- Cache de categorias ----------
+def category_cache_path(root_cat: str) -> str:
+    return os.path.join(CATEGORY_CACHE_DIR, root_cat.replace("Category:", "") + ".json")
+
+def load_category_cache(root_cat: str, ttl_hours: float) -> dict | None:
+    """
+    {"categories": [...], "members": {cat: [membros]}} salvo por uma execução
+    anterior, ou None se não existir / tiver mais de `ttl_hours`.
+    """
+    path = category_cache_path(root_cat)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - cached.get("fetched_at", 0) > ttl_hours * 3600:
+        return None
+    return cached
+
+def save_category_cache(root_cat: str, categories: set[str], members: dict[str, list[dict]],
+                        fetched_at: float | None = None):
+    """`fetched_at` (da árvore) é mantido ao só atualizar as listas de membros."""
+    os.makedirs(CATEGORY_CACHE_DIR, exist_ok=True)
+    path = category_cache_path(root_cat)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "categories": sorted(categories),
+            "members": members,
+        }, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+# ---------- Sync incremental ----------
+def parse_ts(ts: str) -> datetime:
+    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
+def crawl_start_ts() -> str:
+    """Agora (UTC) menos RC_CLOCK_SKEW_SECONDS, no formato de timestamp da API."""
+    start = datetime.now(timezone.utc) - timedelta(seconds=RC_CLOCK_SKEW_SECONDS)
+    return start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def load_crawl_started(base_dir: str) -> str | None:
+    """Início do crawl que gerou o pages.ndjson de base_dir (None se não houver registro)."""
+    try:
+        with open(os.path.join(base_dir, CRAWL_STATE_NAME), "r", encoding="utf-8") as f:
+            return json.load(f).get("started_at")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def save_crawl_started(base_dir: str, started_at: str):
+    path = os.path.join(base_dir, CRAWL_STATE_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"started_at": started_at}, f)
+    os.replace(path + ".tmp", path)
+
+def load_ndjson_index(path: str) -> dict[int, dict]:
+    """Lê um pages.ndjson anterior -> {pageid: registro}. Vazio se não existir."""
+    index = {}
+    if not os.path.isfile(path):
+        return index
+    with open(path, "r", encoding="utf-8") as nd:
+        for line in nd:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            index[rec["pageid"]] = rec
+    return index
+
+def recent_changes_since(since: str) -> dict[int, str]:
+    """{pageid: timestamp mais recente} das páginas (ns=0) editadas/criadas desde `since`."""
+    changed = {}
+    cont = {}
+    while True:
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "list": "recentchanges",
+            "rcend": since,          # rcdir=older: de agora até `since`
+            "rcnamespace": "0",
+            "rctype": "edit|new",
+            "rcprop": "ids|timestamp",
+            "rclimit": "500",
+            **cont
+        }
+        data = mw_get(params)
+        for rc in data.get("query", {}).get("recentchanges", []):
+            pid, ts = rc.get("pageid"), rc.get("timestamp")
+            if pid and ts and ts > changed.get(pid, ""):
+                changed[pid] = ts
+        if "continue" in data:
+            cont = data["continue"]
+        else:
+            break
+    return changed
+
+def latest_timestamps(pageids: list[int]) -> dict[int, str]:
+    """Timestamp da revisão atual por pageid (sem baixar conteúdo)."""
     out = {}
     for i in range(0, len(pageids), 50):
         chunk = pageids[i:i+50]
@@ -111,71 +724,493 @@ def fetch_page_content(pageids: list[int]) -> dict[int, dict]:
             "format": "json",
             "formatversion": "2",
             "prop": "revisions",
-            "rvprop": "content|timestamp",
+            "rvprop": "timestamp",
             "pageids": "|".join(str(pid) for pid in chunk),
         }
         data = mw_get(params)
         for p in data.get("query", {}).get("pages", []):
             revs = p.get("revisions", [])
-            content = revs[0].get("content", "") if revs else ""
-            ts = revs[0].get("timestamp") if revs else None
-            out[p["pageid"]] = {
-                "title": p.get("title",""),
-                "timestamp": ts,
-                "content": content
-            }
-        time.sleep(0.2)
+            if revs:
+                out[p["pageid"]] = revs[0].get("timestamp")
     return out
 
+def changed_pageids(pageids: list[int], previous: dict[int, dict], since: str | None) -> list[int]:
+    """
+    Dentre `pageids`, retorna os que precisam ser (re)baixados:
+    novos, sem timestamp no dump anterior ou alterados desde então.
+    `since` é o início do crawl anterior: o maior timestamp salvo não serve,
+    porque uma página baixada no começo daquele crawl pode ter sido editada
+    antes de outra, baixada depois, ganhar revisão mais nova.
+    """
+    known = [pid for pid in pageids if previous.get(pid, {}).get("timestamp")]
+    if not known:
+        return list(pageids)
+
+    if since and datetime.now(timezone.utc) - parse_ts(since) < timedelta(days=RC_MAX_AGE_DAYS):
+        # rcend é inclusivo: só conta edição mais nova que a revisão já salva
+        recent = recent_changes_since(since)
+        changed = {pid for pid, ts in recent.items()
+                   if pid not in previous or ts > (previous[pid].get("timestamp") or "")}
+    else:
+        # sem registro do crawl anterior ou fora da janela do recentchanges:
+        # compara a revisão atual de cada página
+        latest = latest_timestamps(known)
+        changed = {pid for pid in known if latest.get(pid) != previous[pid]["timestamp"]}
+
+    return [pid for pid in pageids
+            if not previous.get(pid, {}).get("timestamp") or pid in changed]
+
+# ---------- Journal (dump retomável) ----------
+def index_ndjson(path: str, repair: bool = False) -> dict[int, dict]:
+    """
+    {pageid: {"offset", "title", "timestamp"}} de um .ndjson, sem manter o
+    conteúdo em memória. Com repair=True, descarta uma última linha truncada
+    (queda no meio da escrita) para o arquivo poder seguir recebendo append.
+    """
+    index = {}
+    if not os.path.isfile(path):
+        return index
+    good_end = 0
+    with open(path, "rb") as fh:
+        while True:
+            offset = fh.tell()
+            line = fh.readline()
+            if not line:
+                break
+            if not line.endswith(b"\n"):
+                break  # linha incompleta
+            good_end = fh.tell()
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            index[rec["pageid"]] = {
+                "offset": offset,
+                "title": rec.get("title", ""),
+                "timestamp": rec.get("timestamp"),
+            }
+    if repair and os.path.getsize(path) != good_end:
+        with open(path, "r+b") as fh:
+            fh.truncate(good_end)
+    return index
+
+def read_ndjson_at(fh, offset: int) -> dict:
+    fh.seek(offset)
+    return json.loads(fh.readline())
+
+# ---------- Registro de páginas entre categorias ----------
+class PageRegistry:
+    """
+    pageid -> .wiki já gravado nesta execução. Páginas que aparecem em mais de
+    uma categoria-raiz (ex.: armas em Weapons e em Skills) são baixadas uma
+    vez só: nas categorias seguintes o conteúdo é lido do arquivo já salvo e
+    o novo .wiki vira um hardlink para ele (cópia, se o FS não suportar).
+    Só guarda metadados e caminho, não o conteúdo.
+    """
+    def __init__(self):
+        self.pages: dict[int, dict] = {}
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self.pages
+
+    def add(self, pid: int, title: str, ts, path: str):
+        self.pages.setdefault(pid, {"title": title, "timestamp": ts, "path": path})
+
+    def source_path(self, pid: int) -> str | None:
+        entry = self.pages.get(pid)
+        return entry["path"] if entry else None
+
+    def load(self, pid: int) -> dict:
+        entry = self.pages[pid]
+        content = pathlib.Path(entry["path"]).read_text(encoding="utf-8")
+        return {"title": entry["title"], "timestamp": entry["timestamp"], "content": content}
+
+registry = PageRegistry()
+
+def link_file(src: str, dst: str) -> bool:
+    """Faz `dst` apontar para o mesmo arquivo que `src` (hardlink). False se não der."""
+    try:
+        if os.path.exists(dst):
+            if os.path.samefile(src, dst):
+                return True
+            os.remove(dst)
+        os.link(src, dst)
+        return True
+    except OSError:
+        return False
+
+# ---------- Escrita em disco ----------
+def file_sha1(path: str) -> str | None:
+    try:
+        h = hashlib.sha1()
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 16), b""):
+                h.update(block)
+        return h.hexdigest()
+    except OSError:
+        return None
+
+def same_content(path: str, data: bytes) -> bool:
+    """True se `path` já existe com exatamente estes bytes (tamanho, depois sha1)."""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+    except OSError:
+        return False
+    return file_sha1(path) == hashlib.sha1(data).hexdigest()
+
+def publish_file(tmp_path: str, path: str) -> bool:
+    """
+    Troca `path` por `tmp_path` com os.replace (leitores nunca veem um arquivo
+    pela metade). Se o conteúdo for idêntico, descarta o tmp e preserva o
+    mtime do original. Retorna True se o arquivo mudou.
+    """
+    if os.path.isfile(path) and file_sha1(path) == file_sha1(tmp_path):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+def save_page(folder: str, pages_dir: str, pid: int, rec: dict) -> str:
+    """Grava o .wiki da página e devolve a linha correspondente do pages.ndjson."""
+    title = rec.get("title", "")
+    content = rec.get("content", "")
+    ts = rec.get("timestamp")
+    if folder in CONTENT_FILTERS:
+        content = CONTENT_FILTERS[folder](content)
+
+    filename = safe_filename(title, pid)
+    file_path = os.path.join(pages_dir, filename)
+    data = content.encode("utf-8")
+    src = registry.source_path(pid)
+    if same_content(file_path, data):
+        stats.count_file("unchanged")  # não toca o arquivo (mtime intacto)
+    elif src and os.path.basename(src) == filename and link_file(src, file_path):
+        stats.count_file("linked")
+    else:
+        # tmp + os.replace: se file_path for hardlink de outra categoria (Weapons/Skills),
+        # a atualização quebra o link em vez de alterar o .wiki da outra por baixo
+        tmp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        pathlib.Path(tmp_path).write_bytes(data)
+        os.replace(tmp_path, file_path)
+        stats.count_file("written")
+    registry.add(pid, title, ts, file_path)
+
+    print(f"[saved] {folder} :: {title} -> {filename}")
+    return json.dumps({
+        "pageid": pid,
+        "title": title,
+        "timestamp": ts,
+        "content": content
+    }, ensure_ascii=False) + "\n"
+
+def dump_journaled(folder: str, pages_dir: str, ndjson_path: str, all_pages: dict,
+                   pageids: list[int], to_fetch: list[int], previous: dict[int, dict],
+                   shared: list[int], started_at: str):
+    """
+    Modo retomável: cada lote baixado vai direto para os .wiki e para
+    pages.ndjson.journal (append + fsync). Ao reiniciar, pageids já presentes
+    no journal são pulados. No fim, pages.ndjson é montado na ordem de
+    `pageids` lendo o journal por offset, e o journal é removido.
+    Em memória fica só o lote corrente e o índice {pageid: offset}.
+    """
+    journal_path = ndjson_path + ".journal"
+    done = {pid: meta["offset"] for pid, meta in index_ndjson(journal_path, repair=True).items()}
+    # o início que vale é o da execução que abriu o journal: as páginas dela também entram
+    started_path = journal_path + ".started"
+    if done and os.path.isfile(started_path):
+        started_at = min(started_at, pathlib.Path(started_path).read_text(encoding="utf-8").strip())
+    else:
+        pathlib.Path(started_path).write_text(started_at, encoding="utf-8")
+    if done:
+        print(f"[{folder}] journal: retomando, {len(done)} páginas já salvas")
+
+    # mudadas = to_fetch + as que outra categoria-raiz já baixou (shared): nenhuma vem do dump anterior
+    fetch_set = set(to_fetch) | set(shared)
+    with open(journal_path, "ab") as jf:
+        # incremental: páginas sem mudança são copiadas do dump anterior
+        if previous:
+            with stats.timed("disk_write"), open(ndjson_path, "rb") as prev:
+                for pid in pageids:
+                    if pid in previous and pid not in fetch_set and pid not in done:
+                        rec = read_ndjson_at(prev, previous[pid]["offset"])
+                        rec["title"] = all_pages[pid].get("title", rec.get("title", ""))
+                        done[pid] = jf.tell()
+                        jf.write(save_page(folder, pages_dir, pid, rec).encode("utf-8"))
+            jf.flush()
+
+        # já baixadas por outra categoria-raiz nesta execução
+        with stats.timed("disk_write"):
+            for pid in shared:
+                if pid not in done:
+                    done[pid] = jf.tell()
+                    jf.write(save_page(folder, pages_dir, pid, registry.load(pid)).encode("utf-8"))
+            jf.flush()
+
+        todo = [pid for pid in to_fetch if pid not in done]
+        for chunk, part in iter_page_content(todo):
+            with stats.timed("disk_write"):
+                for pid in chunk:
+                    rec = part.get(pid) or {"title": all_pages[pid].get("title", "")}
+                    done[pid] = jf.tell()
+                    jf.write(save_page(folder, pages_dir, pid, rec).encode("utf-8"))
+                jf.flush()
+                os.fsync(jf.fileno())
+
+    tmp_path = ndjson_path + ".tmp"
+    with stats.timed("disk_write"):
+        with open(journal_path, "rb") as jf, open(tmp_path, "wb") as nd:
+            for pid in pageids:
+                jf.seek(done[pid])
+                nd.write(jf.readline())
+        publish_file(tmp_path, ndjson_path)
+    save_crawl_started(os.path.dirname(ndjson_path), started_at)
+    os.remove(journal_path)
+    os.remove(started_path)
+
 # ---------- Pipeline por categoria ----------
-def dump_category_tree(root_cat: str):
-    # 1) todas as subcategorias
-    cat_tree = expand_subcategories(root_cat)
-    cat_tree.add(root_cat)
+def dump_category_tree(root_cat: str, incremental: bool = False, journal: bool = False,
+                       single_query: bool = False, refresh_categories: bool = False,
+                       category_ttl: float = CATEGORY_CACHE_TTL_HOURS,
+                       started_at: str | None = None) -> tuple[int, int]:
+    """
+    Baixa uma categoria-raiz; retorna (páginas gravadas, páginas baixadas).
+    `started_at` é o início da execução (ver crawl_start_ts), gravado ao lado
+    do pages.ndjson para o próximo --incremental.
+    """
+    started_at = started_at or crawl_start_ts()
+    # 1) todas as subcategorias (do cache em disco, se ainda válido)
+    with stats.timed("category_expansion"):
+        cached = None if refresh_categories else load_category_cache(root_cat, category_ttl)
+        if cached:
+            cat_tree = set(cached["categories"])
+            # --incremental: páginas novas entram nas categorias a qualquer momento,
+            # então do cache só vale a árvore; os membros são sempre relistados
+            member_lists = {} if incremental else cached.get("members", {})
+            print(f"[{root_cat}] árvore de categorias do cache ({len(cat_tree)} categorias)")
+        elif single_query:
+            cat_tree, member_lists = crawl_category_tree(root_cat)
+        else:
+            cat_tree = expand_subcategories(root_cat)
+            member_lists = {}
+        cat_tree.add(root_cat)
 
     # 2) páginas únicas (ns=0) em todas as subcats
+    #    (--single-query: os membros já vieram junto da árvore)
     all_pages = {}
-    for cat in sorted(cat_tree):
-        for m in pages_in_category(cat):
-            all_pages[m["pageid"]] = m
+    with stats.timed("category_expansion"):
+        for cat in sorted(cat_tree):
+            if cat in member_lists:
+                members = member_lists[cat]
+            else:
+                members = pages_in_category(cat)
+            member_lists[cat] = members
+            for m in members:
+                all_pages[m["pageid"]] = m
 
-    print(f"[{root_cat}] subcats={len(cat_tree)} | páginas únicas={len(all_pages)}")
+    if not cached:
+        save_category_cache(root_cat, cat_tree, member_lists)
+    elif incremental:
+        save_category_cache(root_cat, cat_tree, member_lists, fetched_at=cached.get("fetched_at"))
 
-    # 3) conteúdo
-    pageids = list(all_pages.keys())
-    details = fetch_page_content(pageids)
+    print(f"[{root_cat}] subcats={len(cat_tree)} | páginas únicas={len(all_pages)}")
 
-    # 4) salvar em pasta da categoria
     folder = root_cat.replace("Category:", "")
     base_dir = os.path.join(OUT_DIR, folder)
     pages_dir = os.path.join(base_dir, "pages")
+    ndjson_path = os.path.join(base_dir, "pages.ndjson")
+
+    # 3) o que baixar: no modo incremental só o que mudou desde o último dump,
+    #    e nunca o que outra categoria-raiz já baixou nesta execução
+    pageids = list(all_pages.keys())
+    if not incremental:
+        previous = {}
+    elif journal:
+        previous = index_ndjson(ndjson_path)
+    else:
+        previous = load_ndjson_index(ndjson_path)
+    to_fetch = changed_pageids(pageids, previous, load_crawl_started(base_dir)) if incremental else list(pageids)
+    if incremental:
+        print(f"[{root_cat}] incremental: {len(to_fetch)} alteradas/novas | {len(pageids) - len(to_fetch)} reaproveitadas")
+
+    shared = [pid for pid in to_fetch if pid in registry]
+    if shared:
+        shared_set = set(shared)
+        to_fetch = [pid for pid in to_fetch if pid not in shared_set]
+        print(f"[{root_cat}] {len(shared)} páginas já baixadas por outra categoria")
+
+    if journal:
+        os.makedirs(pages_dir, exist_ok=True)
+        dump_journaled(folder, pages_dir, ndjson_path, all_pages, pageids, to_fetch, previous, shared, started_at)
+        return len(pageids), len(to_fetch)
+
+    pending = set(to_fetch) | set(shared)
+    details = {}
+    for pid in pageids:
+        if pid in previous and pid not in pending:
+            # título vem da listagem atual (cobre páginas renomeadas)
+            details[pid] = {**previous[pid], "title": all_pages[pid].get("title", previous[pid].get("title", ""))}
+    for pid in shared:
+        details[pid] = registry.load(pid)
+    details.update(fetch_page_content(to_fetch))
+
+    # 4) salvar em pasta da categoria
     os.makedirs(pages_dir, exist_ok=True)
+    tmp_path = ndjson_path + ".tmp"
+    with stats.timed("disk_write"):
+        with open(tmp_path, "w", encoding="utf-8") as nd:
+            for pid in pageids:
+                rec = details.get(pid) or {"title": all_pages[pid].get("title","")}
+                nd.write(save_page(folder, pages_dir, pid, rec))
+        publish_file(tmp_path, ndjson_path)
+    save_crawl_started(base_dir, started_at)
+    return len(pageids), len(to_fetch)
 
-    ndjson_path = os.path.join(base_dir, "pages.ndjson")
-    with open(ndjson_path, "w", encoding="utf-8") as nd:
-        for pid in pageids:
-            d = details.get(pid, {})
-            title = d.get("title", all_pages[pid].get("title",""))
-            content = d.get("content", "")
-            ts = d.get("timestamp")
-
-            filename = safe_filename(title, pid)
-            file_path = os.path.join(pages_dir, filename)
-            pathlib.Path(file_path).write_text(content, encoding="utf-8", newline="\n")
-
-            nd.write(json.dumps({
-                "pageid": pid,
-                "title": title,
-                "timestamp": ts,
-                "content": content
-            }, ensure_ascii=False) + "\n")
-
-            print(f"[saved] {folder} :: {title} -> {filename}")
+# ---------- Atualização pontual (--titles / --pageids) ----------
+def find_page_file(pages_dir: str, pid: int) -> str | None:
+    """.wiki de um pageid dentro de pages/ (inclui subpastas criadas pelo split_skill_pages.py)."""
+    for path in pathlib.Path(pages_dir).rglob(f"*__{pid}.wiki"):
+        return str(path)
+    return None
+
+def refresh_pages(titles: list[str] | None = None, pageids: list[int] | None = None) -> int:
+    """
+    Baixa só as páginas pedidas (lotes de 50 por requisição) e as regrava no
+    lugar: o .wiki existente e a linha correspondente de cada pages.ndjson em
+    que a página já aparece. Páginas fora do dump não são adicionadas (isso é
+    trabalho do crawl completo). Retorna quantas páginas foram atualizadas.
+    """
+    by, items = ("titles", titles) if titles else ("pageids", pageids or [])
+    fetched = {}
+    normalized: dict[str, str] = {}
+    with stats.timed("content_fetch"):
+        for i in range(0, len(items), 50):
+            fetched.update(fetch_content_chunk(items[i:i+50], by=by, normalized=normalized))
+
+    # a API normaliza os títulos pedidos; compara pelo título que ela devolveu
+    found_titles = {rec["title"] for rec in fetched.values()}
+    for item in items:
+        if (normalized.get(item, item) not in found_titles) if by == "titles" else (item not in fetched):
+            print(f"[refresh] não encontrada na wiki: {item}")
+
+    updated = set()
+    with stats.timed("disk_write"):
+        for root_cat in ROOT_CATEGORIES:
+            folder = root_cat.replace("Category:", "")
+            pages_dir = os.path.join(OUT_DIR, folder, "pages")
+            ndjson_path = os.path.join(OUT_DIR, folder, "pages.ndjson")
+            index = index_ndjson(ndjson_path)
+            hits = [pid for pid in fetched if pid in index]
+            if not hits:
+                continue
+            lines = {}
+            for pid in hits:
+                old_file = find_page_file(pages_dir, pid)
+                # mantém o arquivo na subpasta em que já estava (ex.: Skills/pages/Weapons)
+                target_dir = os.path.dirname(old_file) if old_file else pages_dir
+                lines[pid] = save_page(folder, target_dir, pid, fetched[pid])
+                new_file = os.path.join(target_dir, safe_filename(fetched[pid]["title"], pid))
+                if old_file and os.path.abspath(old_file) != os.path.abspath(new_file):
+                    os.remove(old_file)  # página renomeada
+                updated.add(pid)
+            offsets = {index[pid]["offset"]: pid for pid in hits}
+            tmp_path = ndjson_path + ".tmp"
+            with open(ndjson_path, "rb") as src, open(tmp_path, "wb") as dst:
+                while True:
+                    offset = src.tell()
+                    line = src.readline()
+                    if not line:
+                        break
+                    pid = offsets.get(offset)
+                    dst.write(lines[pid].encode("utf-8") if pid is not None else line)
+            publish_file(tmp_path, ndjson_path)
+            print(f"[{root_cat}] {len(hits)} página(s) atualizada(s)")
+
+    for pid in fetched.keys() - updated:
+        print(f"[refresh] {fetched[pid]['title']} ({pid}) não está em nenhum pages.ndjson; rode o crawl completo")
+    return len(updated)
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Baixa as categorias da FEH Wiki para feh_wiki_dump/.")
+    ap.add_argument("--incremental", action="store_true",
+                    help="reaproveita o pages.ndjson existente e baixa só páginas novas/alteradas")
+    ap.add_argument("--api", default=API,
+                    help="endpoint api.php (ex.: um servidor local para testes)")
+    ap.add_argument("--rps", type=float, default=REQUESTS_PER_SECOND,
+                    help="máximo de requisições por segundo à API (0 = sem limite)")
+    ap.add_argument("--workers", type=int, default=FETCH_WORKERS,
+                    help="chunks de conteúdo baixados em paralelo")
+    ap.add_argument("--resume", action="store_true",
+                    help="grava cada lote ao chegar (pages.ndjson.journal) e retoma de onde parou")
+    ap.add_argument("--single-query", action="store_true",
+                    help="lista subcategorias e páginas de cada categoria numa só consulta")
+    ap.add_argument("--refresh-categories", action="store_true",
+                    help="ignora o cache da árvore de categorias e refaz a listagem")
+    ap.add_argument("--category-ttl", type=float, default=CATEGORY_CACHE_TTL_HOURS,
+                    help="validade (horas) do cache da árvore de categorias")
+    ap.add_argument("--http-cache", action="store_true",
+                    help=f"reaproveita respostas da API salvas em {HTTP_CACHE_DIR}")
+    ap.add_argument("--http-cache-ttl", type=float, default=HTTP_CACHE_TTL_SECONDS,
+                    help="segundos em que uma resposta em cache é usada sem revalidar")
+    ap.add_argument("--trim-heroes", action="store_true",
+                    help="guarda das páginas de heróis só os templates usados por build_heroes_json.py")
+    ap.add_argument("--aliases", action="store_true",
+                    help=f"no fim, gera {ALIASES_PATH} (nome/redirect/arquivo -> pageid)")
+    ap.add_argument("--report", metavar="PATH",
+                    help="grava um relatório JSON da execução (latências, erros, bytes, tempos por fase)")
+    target = ap.add_mutually_exclusive_group()
+    target.add_argument("--titles", nargs="+", metavar="TITLE",
+                        help="atualiza só estas páginas no dump existente (sem crawl)")
+    target.add_argument("--pageids", nargs="+", type=int, metavar="ID",
+                        help="como --titles, mas por pageid")
+    rec = ap.add_mutually_exclusive_group()
+    rec.add_argument("--record", metavar="DIR",
+                     help="grava cada requisição/resposta da API em DIR (cassette)")
+    rec.add_argument("--replay", metavar="DIR",
+                     help="responde a API a partir de um cassette gravado, sem rede")
+    args = ap.parse_args()
+    if (args.titles or args.pageids) and (args.incremental or args.resume or args.single_query):
+        ap.error("--titles/--pageids não fazem crawl; não combinam com --incremental/--resume/--single-query")
+    return args
 
 def main():
-    print("Baixando FEH Wiki (Heroes/Weapons/Skills)…")
-    for cat in ROOT_CATEGORIES:
-        dump_category_tree(cat)
+    global http_cache, cassette
+    args = parse_args()
+    # no replay não há servidor para poupar: roda sem rate limit
+    configure_client(args.api, 0 if args.replay else args.rps, args.workers)
+    if args.http_cache:
+        http_cache = ResponseCache(HTTP_CACHE_DIR, args.http_cache_ttl)
+    if args.trim_heroes:
+        CONTENT_FILTERS["Heroes"] = trim_hero_wikitext
+    if args.record:
+        cassette = Cassette(args.record, "record")
+    elif args.replay:
+        cassette = Cassette(args.replay, "replay")
+    if args.titles or args.pageids:
+        t0 = time.perf_counter()
+        n = refresh_pages(titles=args.titles, pageids=args.pageids)
+        print(f"Atualizadas {n} página(s) em {time.perf_counter() - t0:.1f}s")
+    else:
+        print("Baixando FEH Wiki (Heroes/Weapons/Skills)…")
+        # um início para todas as categorias-raiz: páginas compartilhadas vêm de downloads anteriores
+        started_at = crawl_start_ts()
+        for cat in ROOT_CATEGORIES:
+            t0 = time.perf_counter()
+            pages, downloaded = dump_category_tree(
+                cat, incremental=args.incremental, journal=args.resume,
+                single_query=args.single_query,
+                refresh_categories=args.refresh_categories,
+                category_ttl=args.category_ttl, started_at=started_at)
+            stats.record_category(cat, pages, downloaded, time.perf_counter() - t0)
+    if args.aliases:
+        build_alias_index()
+    if http_cache:
+        print(http_cache.summary())
+    if cassette:
+        print(cassette.summary())
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(stats.report(), f, ensure_ascii=False, indent=2)
+        print("Relatório:", args.report)
     print("Concluído! Pastas criadas em:", OUT_DIR)
 
 if __name__ == "__main__":
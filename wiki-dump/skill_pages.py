@@ -0,0 +1,83 @@
+# skill_pages.py
+# Leitura das páginas de Skills para os build_*_json.py: pelas pastas
+# Skills/pages/<Tipo> (split_skill_pages.py) ou pelo Skills/pages.ndjson via
+# manifest.json (split_skill_pages.py --manifest). Se o manifesto não vale
+# mais para o pages.ndjson atual, avisa e volta para as pastas.
+# Usado por build_weapons/passives/assists/specials_json.py e build_skills_json.py.
+
+import os
+import json
+import pathlib
+from typing import Iterable, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(__file__)
+SKILL_PAGES_DIR = os.path.join(BASE_DIR, "feh_wiki_dump", "Skills", "pages")
+MANIFEST_JSON = os.path.join(BASE_DIR, "feh_wiki_dump", "Skills", "manifest.json")
+
+def iter_dir_pages(folder: str):
+    """(nome do arquivo, wikitext) de cada .wiki da pasta, em ordem alfabética."""
+    files = sorted([f for f in os.listdir(folder) if f.endswith(".wiki")], key=str.lower)
+    for fname in files:
+        path = os.path.join(folder, fname)
+        try:
+            yield fname, pathlib.Path(path).read_text(encoding="utf-8")
+        except Exception as e:
+            print(f"[skip] erro lendo {fname}: {e}")
+
+def load_manifest(manifest_path: str) -> Optional[Tuple[str, list]]:
+    """
+    (caminho do pages.ndjson, entradas) se o manifesto ainda descreve o
+    pages.ndjson: mesmo tamanho e mesmo mtime_ns de quando foi gravado.
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        ndjson_path = os.path.join(os.path.dirname(manifest_path), manifest["ndjson"])
+        st = os.stat(ndjson_path)
+        fresh = (st.st_size == manifest["ndjson_size"]
+                 and st.st_mtime_ns == manifest.get("ndjson_mtime_ns"))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"[manifest] {manifest_path} ilegível ({e}); lendo as pastas")
+        return None
+    if not fresh:
+        print(f"[manifest] desatualizado ({ndjson_path} mudou depois do "
+              f"split_skill_pages.py --manifest); lendo as pastas")
+        return None
+    return ndjson_path, manifest["pages"]
+
+def manifest_pages(manifest_path: str, kinds: Iterable[str]) -> Optional[List[Tuple[str, str, str]]]:
+    """
+    (tipo, nome do arquivo, wikitext) das páginas dos tipos pedidos, lidas do
+    pages.ndjson pelo offset em ordem crescente (leitura sequencial). None se o
+    manifesto não vale: quem chama volta para iter_dir_pages.
+    """
+    loaded = load_manifest(manifest_path)
+    if loaded is None:
+        return None
+    ndjson_path, entries = loaded
+    kinds = set(kinds)
+    pages = []
+    try:
+        with open(ndjson_path, "rb") as nd:
+            for e in sorted((e for e in entries if e["type"] in kinds), key=lambda e: e["offset"]):
+                nd.seek(e["offset"])
+                rec = json.loads(nd.read(e["length"]))
+                if rec.get("pageid") != e["pageid"]:
+                    raise ValueError(f"pageid {e['pageid']} fora do offset gravado")
+                pages.append((e["type"], e["file"], rec.get("content", "")))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"[manifest] desatualizado ({e}); lendo as pastas")
+        return None
+    return pages
+
+def kind_pages(kind: str, folder: str, manifest_path: Optional[str] = None):
+    """
+    (nome do arquivo, wikitext) das páginas de um tipo, na ordem dos builders:
+    do manifesto se manifest_path for dado e ainda valer, senão da pasta.
+    """
+    pages = manifest_pages(manifest_path, (kind,)) if manifest_path else None
+    if pages is not None:
+        return sorted(((fname, text) for _, fname, text in pages), key=lambda p: p[0].lower())
+    if not os.path.isdir(folder):
+        raise SystemExit(f"Pasta não encontrada: {folder}")
+    return iter_dir_pages(folder)
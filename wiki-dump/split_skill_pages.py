@@ -1,9 +1,21 @@
 # split_skill_pages.py
 # Coloque este arquivo DENTRO da pasta que contém os .wiki de Skills (ex.: feh_wiki_dump/Skills/pages)
+# Uso: python split_skill_pages.py [--jobs N] [--manifest] [--bench]
+#   (o tipo de cada conteúdo já visto fica em ../.type-cache.json; páginas iguais não são reclassificadas)
+#   --jobs N    classifica em N processos (0 = todos os núcleos); as movimentações continuam em ordem
+#   --manifest  não move nada: grava ../manifest.json (pageid -> tipo, offset no ../pages.ndjson)
+#               para os build_*_json.py lerem com --manifest
+#   --bench     só mede a classificação, não move nada
 # Requer: pip install mwparserfromhell
 
 import os
+import re
+import json
+import time
+import hashlib
 import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import mwparserfromhell as mw
 
@@ -28,11 +40,56 @@ IGNORE_TEMPLATES = {
     "short description", "infobox", "navbox", "quote",
 }
 
-def detect_type(wikitext: str) -> str:
+# Leitura rápida: tokens que importam para achar nomes de template. Tudo que
+# o mwparserfromhell trataria de forma especial ({{{arg}}}, comentários,
+# nowiki/pre...) torna a página "ambígua" e ela vai para o parser completo.
+RE_SCAN_TOKEN = re.compile(
+    r"\{\{\{|\{\{|\}\}|<!--|<(?:nowiki|pre|source|syntaxhighlight|math|includeonly|noinclude|onlyinclude)\b",
+    re.I)
+RE_SCAN_NAME = re.compile(r"([^|{}<>\[\]]*)(\||\}\})")
+
+AMBIGUOUS = None
+
+def scan_type(wikitext: str):
     """
-    Retorna 'Weapons', 'Passives', 'Assists', 'Specials' ou 'Unknown'
-    analisando o primeiro template compatível.
+    Lê os nomes dos templates na ordem em que abrem (a mesma do
+    filter_templates) e para no primeiro que está no TEMPLATE_MAP, sem montar
+    a árvore. Retorna o tipo, 'Unknown', ou AMBIGUOUS quando só o parser
+    completo sabe responder.
     """
+    opens = []  # posições de "{{" ainda sem "}}"
+    candidate = None  # (posição, tipo) do primeiro template do mapa, até confirmar que fecha
+    for m in RE_SCAN_TOKEN.finditer(wikitext):
+        tok = m.group(0)
+        if tok == "{{":
+            if candidate:
+                opens.append(m.start())  # template dentro do candidato
+                continue
+            nm = RE_SCAN_NAME.match(wikitext, m.end())
+            if not nm:
+                return AMBIGUOUS
+            raw = nm.group(1).strip().lower()
+            if "\n" in raw:
+                return AMBIGUOUS
+            opens.append(m.start())
+            if raw in IGNORE_TEMPLATES:
+                continue
+            name = " ".join(raw.split())
+            if name in TEMPLATE_MAP:
+                candidate = (m.start(), TEMPLATE_MAP[name])
+        elif tok == "}}":
+            if not opens:
+                return AMBIGUOUS
+            start = opens.pop()
+            if candidate and start == candidate[0]:
+                return candidate[1]
+        else:
+            return AMBIGUOUS
+    # sem candidato: só é seguro dizer Unknown se todos os "{{" fecharam
+    return "Unknown" if not opens and not candidate else AMBIGUOUS
+
+def detect_type_full(wikitext: str) -> str:
+    """Classificação pelo parse completo (mwparserfromhell)."""
     try:
         parsed = mw.parse(wikitext)
     except Exception:
@@ -50,8 +107,203 @@ def detect_type(wikitext: str) -> str:
             return TEMPLATE_MAP[name]
     return "Unknown"
 
+def detect_type(wikitext: str) -> str:
+    """
+    Retorna 'Weapons', 'Passives', 'Assists', 'Specials' ou 'Unknown'
+    analisando o primeiro template compatível.
+    """
+    typ = scan_type(wikitext)
+    return detect_type_full(wikitext) if typ is AMBIGUOUS else typ
+
+# ---------- Cache de classificação ----------
+DETECT_VERSION = 1  # suba ao mudar a lógica do scan_type/detect_type_full: invalida o cache
+
+class TypeCache:
+    """
+    sha1(conteúdo) -> tipo, salvo em disco entre execuções. Só vale para as
+    mesmas regras (TEMPLATE_MAP/IGNORE_TEMPLATES/DETECT_VERSION): se mudarem, começa vazio.
+    Ao salvar, guarda só os conteúdos vistos nesta execução.
+    """
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.types: dict[str, str] = {}
+        self.seen: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        if path is None:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("rules") == self.rules():
+            self.types = data.get("types", {})
+
+    @staticmethod
+    def rules() -> str:
+        spec = [sorted(TEMPLATE_MAP.items()), sorted(IGNORE_TEMPLATES), DETECT_VERSION]
+        return hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()
+
+    def lookup(self, text: str) -> tuple[str, str, bool]:
+        """(tipo, sha1, veio do cache?) sem alterar contadores; seguro nos processos do --jobs."""
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        typ = self.types.get(key)
+        if typ is not None:
+            return typ, key, True
+        return detect_type(text), key, False
+
+    def record(self, key: str, typ: str, hit: bool):
+        self.seen[key] = typ
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def save(self):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"rules": self.rules(), "types": self.seen}, f)
+        os.replace(tmp_path, self.path)
+
+    def summary(self) -> str:
+        return f"  cache de tipos: {self.hits} acertos, {self.misses} faltas"
+
+type_cache = TypeCache()  # trocado em main(); nos processos do --jobs, via use_type_cache
+
+def use_type_cache(cache: TypeCache):
+    global type_cache
+    type_cache = cache
+
+def classify_text(text: str) -> tuple[str, str, bool]:
+    return type_cache.lookup(text)
+
+def bench(base: Path):
+    """Compara scan_type + fallback com o parse completo em todos os .wiki (inclui subpastas)."""
+    texts = [fp.read_text(encoding="utf-8") for fp in sorted(base.rglob("*.wiki"))]
+    t0 = time.perf_counter()
+    full = [detect_type_full(t) for t in texts]
+    t1 = time.perf_counter()
+    fast = [detect_type(t) for t in texts]
+    t2 = time.perf_counter()
+    fallback = sum(scan_type(t) is AMBIGUOUS for t in texts)
+    diffs = sum(a != b for a, b in zip(full, fast))
+    print(f"{len(texts)} páginas | parse completo {t1 - t0:.2f}s | leitura rápida {t2 - t1:.2f}s "
+          f"({(t1 - t0) / max(t2 - t1, 1e-9):.1f}x) | {fallback} no parser completo | {diffs} divergências")
+
+# ---------- Manifesto ----------
+# Mesmo nome de arquivo que o pull-wiki.py usa para o .wiki; os builders
+# ordenam e nomeiam (fallback) por ele, como fariam listando a pasta.
+INVALID_WIN_CHARS = r'[<>:"/\\|?*\x00-\x1F]'
+RESERVED_NAMES = {
+    "CON","PRN","AUX","NUL",
+    *{f"COM{i}" for i in range(1,10)},
+    *{f"LPT{i}" for i in range(1,10)},
+}
+def safe_filename(title: str, pageid: int, maxlen: int = 150) -> str:
+    name = re.sub(INVALID_WIN_CHARS, " ", title).strip()
+    name = re.sub(r"\s{2,}", " ", name)
+    name = name.rstrip(" .")
+    if name.upper() in RESERVED_NAMES or name == "":
+        name = f"page_{pageid}"
+    if len(name) > maxlen:
+        name = name[:maxlen].rstrip(" .")
+    return f"{name}__{pageid}.wiki"
+
+def write_manifest(ndjson_path: Path, manifest_path: Path, jobs: int) -> dict:
+    """
+    Classifica cada página do pages.ndjson e grava o manifesto:
+    {"ndjson", "ndjson_size", "ndjson_mtime_ns", "pages": [{pageid, title, file, type, offset, length}]}.
+    Nenhum .wiki é lido, copiado ou movido. Retorna as contagens por tipo.
+    """
+    # tamanho/mtime de antes da leitura: se o pull-wiki.py regravar o ndjson no meio,
+    # o manifesto já nasce desatualizado e os builders voltam para as pastas
+    st = os.stat(ndjson_path)
+    entries, texts = [], []
+    with open(ndjson_path, "rb") as nd:
+        while True:
+            offset = nd.tell()
+            line = nd.readline()
+            if not line.strip():
+                if not line:
+                    break
+                continue
+            rec = json.loads(line)
+            entries.append({
+                "pageid": rec["pageid"],
+                "title": rec.get("title", ""),
+                "file": safe_filename(rec.get("title", ""), rec["pageid"]),
+                "offset": offset,
+                "length": len(line),
+            })
+            texts.append(rec.get("content", ""))
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=use_type_cache,
+                                 initargs=(type_cache,)) as pool:
+            results = list(pool.map(classify_text, texts, chunksize=64))
+    else:
+        results = map(classify_text, texts)
+
+    counts = {"Weapons":0, "Passives":0, "Assists":0, "Specials":0, "Unknown":0}
+    for entry, (typ, key, hit) in zip(entries, results):
+        type_cache.record(key, typ, hit)
+        entry["type"] = typ
+        counts[typ] += 1
+
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "ndjson": ndjson_path.name,
+            "ndjson_size": st.st_size,
+            "ndjson_mtime_ns": st.st_mtime_ns,
+            "pages": entries,
+        }, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, manifest_path)
+    return counts
+
+def classify_file(fp: Path):
+    """(tipo, erro de leitura ou None, sha1, veio do cache?) de um .wiki; roda nos processos do --jobs."""
+    try:
+        text = fp.read_text(encoding="utf-8")
+    except Exception as e:
+        return "Unknown", e, None, False
+    typ, key, hit = classify_text(text)
+    return typ, None, key, hit
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Separa os .wiki de Skills em pastas por tipo.")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="processos para classificar as páginas (0 = todos os núcleos)")
+    ap.add_argument("--manifest", action="store_true",
+                    help="grava ../manifest.json a partir do ../pages.ndjson em vez de mover arquivos")
+    ap.add_argument("--bench", action="store_true",
+                    help="compara a leitura rápida com o parse completo, sem mover nada")
+    return ap.parse_args()
+
 def main():
+    args = parse_args()
     base = Path(__file__).parent
+    if args.bench:
+        bench(base)
+        return
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    use_type_cache(TypeCache(base.parent / ".type-cache.json"))
+
+    if args.manifest:
+        ndjson_path = base.parent / "pages.ndjson"
+        if not ndjson_path.is_file():
+            raise SystemExit(f"Arquivo não encontrado: {ndjson_path}")
+        manifest_path = base.parent / "manifest.json"
+        counts = write_manifest(ndjson_path, manifest_path, jobs)
+        type_cache.save()
+        print(f"Manifesto: {manifest_path}")
+        print("\nResumo:")
+        for k,v in counts.items():
+            print(f"  {k}: {v}")
+        print(type_cache.summary())
+        return
+
     files = sorted(base.glob("*.wiki"))
 
     if not files:
@@ -64,22 +316,27 @@ def main():
 
     counts = {"Weapons":0, "Passives":0, "Assists":0, "Specials":0, "Unknown":0}
 
-    for fp in files:
-        try:
-            text = fp.read_text(encoding="utf-8")
-        except Exception as e:
-            print(f"[skip] erro lendo {fp.name}: {e}")
+    if jobs > 1:
+        # classifica tudo em paralelo; mover/copiar fica numa única passada, em ordem
+        with ProcessPoolExecutor(max_workers=jobs, initializer=use_type_cache,
+                                 initargs=(type_cache,)) as pool:
+            results = list(pool.map(classify_file, files, chunksize=64))
+    else:
+        results = map(classify_file, files)
+
+    for fp, (typ, err, key, hit) in zip(files, results):
+        if key:
+            type_cache.record(key, typ, hit)
+        dest = base / typ / fp.name
+        if err is not None:
+            print(f"[skip] erro lendo {fp.name}: {err}")
             counts["Unknown"] += 1
-            dest = base / "Unknown" / fp.name
             if MOVE_FILES:
                 shutil.move(str(fp), str(dest))
             else:
                 shutil.copy2(str(fp), str(dest))
             continue
 
-        typ = detect_type(text)
-        dest = base / typ / fp.name
-
         try:
             if MOVE_FILES:
                 shutil.move(str(fp), str(dest))
@@ -90,9 +347,11 @@ def main():
         except Exception as e:
             print(f"[erro] {fp.name} -> {typ}: {e}")
 
+    type_cache.save()
     print("\nResumo:")
     for k,v in counts.items():
         print(f"  {k}: {v}")
+    print(type_cache.summary())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,91 @@
+# wiki_common.py
+# Peças compartilhadas pelo pull-wiki.py e pelo build_from_cargo.py: nome de
+# arquivo dos .wiki, chave de requisição, cassete de gravação/replay e backoff.
+# Não tem dependências além da biblioteca padrão.
+
+import os
+import re
+import json
+import random
+import hashlib
+import threading
+
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+RETRY_HTTP_STATUS = {429, 500, 502, 503, 504}
+RETRY_API_CODES = {"maxlag", "ratelimited", "readonly"}  # demais erros da API não melhoram com retry
+
+# ---------- Sanitização Windows ----------
+INVALID_WIN_CHARS = r'[<>:"/\\|?*\x00-\x1F]'
+RESERVED_NAMES = {
+    "CON","PRN","AUX","NUL",
+    *{f"COM{i}" for i in range(1,10)},
+    *{f"LPT{i}" for i in range(1,10)},
+}
+def safe_filename(title: str, pageid: int, maxlen: int = 150) -> str:
+    name = re.sub(INVALID_WIN_CHARS, " ", title).strip()
+    name = re.sub(r"\s{2,}", " ", name)
+    name = name.rstrip(" .")
+    if name.upper() in RESERVED_NAMES or name == "":
+        name = f"page_{pageid}"
+    if len(name) > maxlen:
+        name = name[:maxlen].rstrip(" .")
+    return f"{name}__{pageid}.wiki"
+
+# ---------- Gravação / replay ----------
+def params_key(params: dict) -> str:
+    """Chave estável de uma requisição: sha1 dos params normalizados (ordenados, como str)."""
+    norm = sorted((str(k), str(v)) for k, v in params.items())
+    return hashlib.sha1(json.dumps(norm, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+class Cassette:
+    """
+    Diretório com um par requisição/resposta por chamada do mw_get (chave =
+    params_key). mode="record" grava tudo o que vier da API; mode="replay"
+    responde só do disco, sem rede e sem rate limit, para medir o pipeline
+    inteiro de forma reproduzível numa máquina offline.
+    """
+    def __init__(self, root: str, mode: str):
+        self.root = root
+        self.mode = mode
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def _path(self, params: dict) -> str:
+        key = params_key(params)
+        return os.path.join(self.root, key[:2], key + ".json")
+
+    def record(self, params: dict, data: dict):
+        path = self._path(params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"params": params, "data": data}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        with self.lock:
+            self.count += 1
+
+    def play(self, params: dict) -> dict:
+        try:
+            with open(self._path(params), "r", encoding="utf-8") as f:
+                data = json.load(f)["data"]
+        except OSError:
+            raise RuntimeError(f"Cassette sem resposta gravada para: {params}")
+        with self.lock:
+            self.count += 1
+        return data
+
+    def summary(self) -> str:
+        verb = "gravadas" if self.mode == "record" else "reproduzidas"
+        return f"[cassette] {self.count} respostas {verb} em {self.root}"
+
+# ---------- Retry ----------
+def backoff_delay(attempt: int, retry_after: str | None = None) -> float:
+    """Retry-After do servidor, se vier em segundos; senão exponencial com jitter."""
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass  # formato data HTTP: usa o backoff
+    cap = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return cap / 2 + random.uniform(0, cap / 2)